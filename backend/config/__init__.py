@@ -1,6 +1,6 @@
 """
 Backend configuration package
 """
-from .config import Config
+from .config import Config, load_private_key
 
-__all__ = ["Config"]
\ No newline at end of file
+__all__ = ["Config", "load_private_key"]
\ No newline at end of file
@@ -2,7 +2,38 @@
 Configuration management for the Enhanced Endorsement API
 """
 import os
-from typing import Optional
+from typing import Dict, Optional, Tuple
+
+# key file path -> ((st_mtime_ns, st_size), PEM text) of its last read
+_private_key_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+def load_private_key(key_file: str) -> Optional[str]:
+    """
+    Load the signing key from the PRIVATE_KEY_PEM environment variable or
+    ``key_file``, rereading the file only when its mtime or size changes.
+    """
+    key_from_env = os.environ.get("PRIVATE_KEY_PEM")
+    if key_from_env:
+        return key_from_env
+
+    try:
+        st = os.stat(key_file)
+    except OSError:
+        return None
+
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _private_key_cache.get(key_file)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    try:
+        with open(key_file, 'r') as f:
+            key_pem = f.read()
+    except OSError:
+        return None
+    _private_key_cache[key_file] = (signature, key_pem)
+    return key_pem
 
 
 class Config:
@@ -20,20 +51,7 @@ class Config:
     
     def get_private_key(self) -> Optional[str]:
         """Load private key from environment or file"""
-        # Try environment variable first
-        key_from_env = os.environ.get("PRIVATE_KEY_PEM")
-        if key_from_env:
-            return key_from_env
-            
-        # Try loading from file
-        if os.path.exists(self.private_key_file):
-            try:
-                with open(self.private_key_file, 'r') as f:
-                    return f.read()
-            except Exception:
-                pass
-                
-        return None
+        return load_private_key(self.private_key_file)
     
     @property
     def cors_origins(self):
@@ -6,7 +6,9 @@ from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
+import itertools
 import logging
+import os
 import traceback
 from enum import Enum
 
@@ -14,6 +16,13 @@ from enum import Enum
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Source of short, unique IDs for correlating unhandled errors with logs
+_error_ids = itertools.count(1)
+
+# PDF readers accept the header anywhere in the first KiB of the file
+PDF_MAGIC = b"%PDF-"
+PDF_HEADER_WINDOW = 1024
+
 class ErrorCode(str, Enum):
     VALIDATION_ERROR = "VALIDATION_ERROR"
     FILE_UPLOAD_ERROR = "FILE_UPLOAD_ERROR" 
@@ -39,6 +48,10 @@ class APIError(Exception):
         self.details = details
         super().__init__(self.message)
 
+    def __reduce__(self):
+        # Rebuild from all fields so the error survives a process pool.
+        return (type(self), (self.status_code, self.error_code, self.message, self.details))
+
 def create_error_response(
     status_code: int,
     error_code: ErrorCode,
@@ -127,8 +140,10 @@ async def api_exception_handler(request: Request, exc: APIError):
 
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions"""
-    error_id = str(hash(str(exc)))[:8]
-    logger.error(f"Unhandled exception {error_id} on {request.url}: {str(exc)}")
+    error_id = f"{next(_error_ids):08x}"
+    logger.error(
+        f"Unhandled exception {error_id} ({type(exc).__name__}) on {request.url}: {str(exc)}"
+    )
     logger.error(f"Traceback: {traceback.format_exc()}")
     
     return JSONResponse(
@@ -151,13 +166,19 @@ def validate_file_upload(file: Any, max_size_mb: int = 10) -> None:
             message="No file provided"
         )
     
-    # Check file size
-    if hasattr(file, 'size') and file.size > max_size_mb * 1024 * 1024:
+    # Check file size without reading the body: UploadFile.size is set by the
+    # multipart parser; failing that, seek to the end of the spooled file
+    size = getattr(file, 'size', None)
+    stream = getattr(file, 'file', None)
+    if size is None and stream is not None:
+        size = stream.seek(0, os.SEEK_END)
+        stream.seek(0)
+    if size is not None and size > max_size_mb * 1024 * 1024:
         raise APIError(
-            status_code=400,
+            status_code=413,
             error_code=ErrorCode.FILE_UPLOAD_ERROR,
             message=f"File size must be less than {max_size_mb}MB",
-            details=f"File size: {file.size / (1024 * 1024):.2f}MB"
+            details=f"File size: {size / (1024 * 1024):.2f}MB"
         )
     
     # Check file type
@@ -171,6 +192,17 @@ def validate_file_upload(file: Any, max_size_mb: int = 10) -> None:
                 details=f"Provided type: {file.content_type}"
             )
 
+    # Check the bytes themselves rather than trusting the declared type
+    if stream is not None:
+        head = stream.read(PDF_HEADER_WINDOW)
+        stream.seek(0)
+        if PDF_MAGIC not in head:
+            raise APIError(
+                status_code=400,
+                error_code=ErrorCode.FILE_UPLOAD_ERROR,
+                message="File content is not a PDF document"
+            )
+
 def handle_processing_error(operation: str, error: Exception) -> APIError:
     """Convert processing errors to API errors"""
     if "permission" in str(error).lower() or "access" in str(error).lower():
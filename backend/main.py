@@ -1,53 +1,115 @@
+import asyncio
+import logging
 import os
+import secrets
 import sys
-import uuid
-from typing import Tuple, Optional
+import time
+from typing import Any, Dict, Optional, Set
+from urllib.parse import quote
+from contextlib import asynccontextmanager
 
 # Add the project root to Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Request
+from fastapi import BackgroundTasks, FastAPI, File, UploadFile, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from pypdf import PdfReader
-from werkzeug.utils import secure_filename
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    DefaultResponse = JSONResponse
+
 from backend.routes import endorsement, documents, letters
 from backend.models import HealthCheckResponse
 from backend.error_handler import (
     APIError, 
+    ErrorCode,
+    handle_processing_error,
     validation_exception_handler,
     http_exception_handler,
     api_exception_handler,
     general_exception_handler
 )
-
-
-
-from packages.LocalAgentCore.InstrumentAnnotator.parser import BillParser  # noqa: E402
-from packages.LocalAgentCore.InstrumentAnnotator.stamper import (
-    attach_endorsement_to_pdf_function,  # noqa: E402
-)
-from packages.LocalAgentCore.InstrumentClassifier.classifier import (
-    parse_sovereign_instrument,  # noqa: E402
+from backend.pipeline import (
+    UPLOAD_DIR_PREFIX,
+    UPLOAD_FOLDER,
+    UPLOAD_MAX_AGE_SECONDS,
+    allowed_file,
+    extract_document_text,
+    process_instrument_with_stat,
+    purge_stale_uploads,
+    run_in_process_pool,
+    safe_filename,
+    save_upload,
+    shutdown_process_pool,
+    start_process_pool,
+    warm_up,
 )
-from packages.LocalAgentCore.RemedyCompiler.engine import (
-    apply_endorsement,
-)  # noqa: E402
+
+logger = logging.getLogger(__name__)
 
 # --- Basic FastAPI App Setup ---
-UPLOAD_FOLDER = "/tmp/uploads"
-ALLOWED_EXTENSIONS = {"pdf"}
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
+# When set (e.g. "/internal-uploads/"), /uploads/{filename} hands the file to
+# the reverse proxy with X-Accel-Redirect so it is sent with sendfile(2)
+# instead of being streamed through Python. The proxy needs a matching
+# internal location, e.g.:
+#   location /internal-uploads/ { internal; alias /app/uploads/; }
+UPLOADS_ACCEL_REDIRECT_PREFIX = os.environ.get("UPLOADS_ACCEL_REDIRECT_PREFIX")
+
+
+# Upload routes whose size limit is enforced from Content-Length, before the
+# multipart body is read and spooled. The allowance covers multipart framing.
+MAX_UPLOAD_BODY_BYTES = {
+    "/api/upload-document": 10 * 1024 * 1024,
+    "/api/endorse-bill/": 10 * 1024 * 1024,
+    "/api/scan-contract": 10 * 1024 * 1024,
+}
+MULTIPART_OVERHEAD_ALLOWANCE = 64 * 1024
+
+
+UPLOAD_JANITOR_INTERVAL = int(os.environ.get("UPLOAD_JANITOR_INTERVAL", 600))
+
+
+async def upload_janitor() -> None:
+    """Periodically remove stale files so UPLOAD_FOLDER stays small."""
+    while True:
+        await asyncio.sleep(UPLOAD_JANITOR_INTERVAL)
+        try:
+            await asyncio.to_thread(purge_stale_uploads)
+        except Exception:
+            logger.exception("Failed to purge stale uploads")
+        expire_jobs()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the pipeline off the event loop before serving requests.
+    await asyncio.to_thread(warm_up)
+    # The routers write here on every upload; create it once up front.
+    for directory in {endorsement.UPLOAD_DIR, documents.UPLOAD_DIR}:
+        os.makedirs(directory, exist_ok=True)
+    start_process_pool()
+    janitor = asyncio.create_task(upload_janitor())
+    try:
+        yield
+    finally:
+        janitor.cancel()
+        shutdown_process_pool()
+
 
 app = FastAPI(
     title="Sovereign Finance Cockpit API",
     description="API for document processing and legal instrument analysis",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=DefaultResponse,
+    lifespan=lifespan,
 )
 
 # Add error handlers
@@ -56,7 +118,37 @@ app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(APIError, api_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
-# Add CORS middleware
+class RejectOversizedUploads:
+    """
+    Answer 413 for upload routes whose Content-Length is over their limit,
+    before the body is read. Plain ASGI, so every other request passes
+    straight through after one dict lookup.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = MAX_UPLOAD_BODY_BYTES.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is not None:
+            request = Request(scope)
+            content_length = request.headers.get("content-length")
+            if content_length and content_length.isdigit() and (
+                int(content_length) > limit + MULTIPART_OVERHEAD_ALLOWANCE
+            ):
+                response = await api_exception_handler(request, APIError(
+                    status_code=413,
+                    error_code=ErrorCode.FILE_UPLOAD_ERROR,
+                    message=f"File size must be less than {limit // (1024 * 1024)}MB",
+                    details=f"Request size: {int(content_length) / (1024 * 1024):.2f}MB"
+                ))
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+app.add_middleware(RejectOversizedUploads)
+
+# Add CORS middleware (added last so it also wraps the responses above)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "http://127.0.0.1:5173"],
@@ -110,6 +202,12 @@ async def serve_file(filename: str):
     """Serve files from the uploads directory"""
     file_path = os.path.join("uploads", filename)
     if os.path.exists(file_path):
+        if UPLOADS_ACCEL_REDIRECT_PREFIX:
+            quoted = quote(filename)
+            return Response(headers={
+                "X-Accel-Redirect": UPLOADS_ACCEL_REDIRECT_PREFIX + quoted,
+                "Content-Disposition": f"attachment; filename*=utf-8''{quoted}",
+            })
         return FileResponse(file_path, filename=filename)
     else:
         raise HTTPException(status_code=404, detail="File not found")
@@ -125,133 +223,158 @@ async def interactive_positioner():
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Positioner tool not found")
 
+# Read once at startup; the handler then serves it without touching disk.
+try:
+    with open(os.path.join("static", "favicon.ico"), "rb") as f:
+        _FAVICON_BYTES: Optional[bytes] = f.read()
+except OSError:
+    _FAVICON_BYTES = None
+
+
 @app.get("/favicon.ico")
 async def favicon():
     """Serve favicon.ico or return 204 No Content if not available."""
-    from fastapi import Response
-    favicon_path = os.path.join("static", "favicon.ico")
-    if os.path.exists(favicon_path):
-        return FileResponse(favicon_path, media_type="image/x-icon")
+    if _FAVICON_BYTES is not None:
+        return Response(
+            content=_FAVICON_BYTES,
+            media_type="image/x-icon",
+            headers={"Cache-Control": "public, max-age=86400"},
+        )
     return Response(status_code=204)
 
 
-def allowed_file(filename: str) -> bool:
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# --- FastAPI API Endpoints ---
+@app.get("/")
+def index():
+    return {"message": "Hello, World!"}
 
-# --- Main Workflow ---
-def process_instrument(file_path: str) -> str:
-    """
-    Orchestrates the OCR -> Parse -> Generate -> Stamp workflow.
-    
-    Args:
-        file_path: Path to the PDF file to process
-        
-    Returns:
-        Path to the processed PDF file
-        
-    Raises:
-        APIError: If processing fails at any step
-    """
-    from backend.error_handler import APIError, ErrorCode, handle_processing_error
-    
-    print(f"Processing file: {file_path}")
 
-    # 1. OCR: Extract text from PDF
-    try:
-        if not os.path.exists(file_path):
-            raise APIError(
-                status_code=404,
-                error_code=ErrorCode.NOT_FOUND,
-                message="Input file not found",
-                details=f"File path: {file_path}"
-            )
-            
-        reader = PdfReader(file_path)
-        if len(reader.pages) == 0:
-            raise APIError(
-                status_code=400,
-                error_code=ErrorCode.PROCESSING_ERROR,
-                message="PDF file contains no pages"
-            )
-            
-        first_page = reader.pages[0]
-        raw_text = first_page.extract_text()
-        if not raw_text:
-            print("No text layer found, attempting OCR (placeholder)...")
-            raw_text = "OCR Placeholder: Account Number: 123 Amount Due: $456"
-        print(f"Extracted Text: {raw_text[:200]}...")
-    except APIError:
-        raise
-    except Exception as e:
-        raise handle_processing_error("text extraction", e)
+def stamped_pdf_response(processed_path: str, stat_result: os.stat_result) -> FileResponse:
+    # The stat taken right after stamping is reused for the Content-Length
+    # and ETag headers, so Starlette doesn't stat the file again.
+    return FileResponse(
+        processed_path,
+        media_type='application/pdf',
+        filename=os.path.basename(processed_path),
+        stat_result=stat_result,
+    )
 
-    # 2. Parse: Use BillParser to get structured data
-    try:
-        parser = BillParser()
-        bill_data = parser.parse_bill(raw_text)
-        bill_data["recipient"] = "Daddy"
-        print(f"Parsed Bill Data: {bill_data}")
-    except Exception as e:
-        raise handle_processing_error("bill parsing", e)
 
-    # 3. Generate: Create the endorsement
-    try:
-        remedy_text = "Conditional Acceptance for Value - UCC 1-308"
-        endorsed_bill = apply_endorsement(bill_data, "draft", remedy_text)
-        print(f"Generated Endorsement: {endorsed_bill['endorsements']}")
-    except Exception as e:
-        raise handle_processing_error("endorsement generation", e)
+@app.post("/upload")
+async def upload_file_endpoint(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
+    if not file:
+        raise HTTPException(status_code=400, detail="No file part")
+    if file.filename == "":
+        raise HTTPException(status_code=400, detail="No selected file")
+    if not allowed_file(file.filename):
+        raise HTTPException(status_code=400, detail="File type not allowed")
+
+    # Token-prefixed so concurrent uploads of the same filename never share
+    # an input or stamped output, or delete each other's response.
+    file_path = f"{UPLOAD_DIR_PREFIX}{secrets.token_hex(16)}_{safe_filename(file.filename)}"
+    content_hash = await asyncio.to_thread(save_upload, file.file, file_path)
+
+    # process_instrument returns the stamped path or raises APIError, which
+    # the app's exception handlers turn into the error response.
+    processed_path, stat_result = await run_in_process_pool(
+        process_instrument_with_stat, file_path, content_hash
+    )
+    # The stamped copy is only needed for this response.
+    background_tasks.add_task(os.remove, processed_path)
+    return stamped_pdf_response(processed_path, stat_result)
 
-    # 4. Stamp: Apply the endorsement to the PDF
-    try:
-        output_filename = f"processed_{os.path.basename(file_path)}"
-        output_path = os.path.join(UPLOAD_FOLDER, output_filename)
-
-        attach_endorsement_to_pdf_function(
-            original_pdf_path=file_path,
-            endorsement_data=endorsed_bill,
-            output_pdf_path=output_path,
-            ink_color="blue",
-            page_index=0,  # Stamp on the first page
-        )
 
-        print(f"Stamped PDF created at: {output_path}")
-        return output_path
-    except Exception as e:
-        raise handle_processing_error("PDF stamping", e)
+# --- Background processing jobs ---
+# Jobs run as tasks in this process, so status is only visible to the worker
+# that accepted the upload; run a single worker when using these endpoints.
+JOBS: Dict[str, Dict[str, Any]] = {}
+_job_tasks: Set[asyncio.Task] = set()
 
 
-# --- FastAPI API Endpoints ---
-@app.get("/")
-def index():
-    return {"message": "Hello, World!"}
+async def _run_job(job_id: str, file_path: str, content_hash: str) -> None:
+    job = JOBS[job_id]
+    job["status"] = "processing"
+    try:
+        job["result"] = await run_in_process_pool(
+            process_instrument_with_stat, file_path, content_hash
+        )
+        job["status"] = "done"
+    except APIError as e:
+        job["status"], job["error"] = "failed", e.message
+    except asyncio.CancelledError:
+        # e.g. the pool was shut down with the job still queued
+        job["status"], job["error"] = "failed", "Job was cancelled"
+        raise
+    except Exception as e:
+        job["status"], job["error"] = "failed", str(e)
 
 
-@app.post("/upload")
-def upload_file_endpoint(file: UploadFile = File(...)):
-    if not file:
-        raise HTTPException(status_code=400, detail="No file part")
+@app.post("/jobs", status_code=202)
+async def create_job_endpoint(file: UploadFile = File(...)):
+    """Accept an upload for processing and return immediately with a job id."""
     if file.filename == "":
         raise HTTPException(status_code=400, detail="No selected file")
-    if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(UPLOAD_FOLDER, filename)
-        with open(file_path, "wb") as buffer:
-            buffer.write(file.file.read())
+    if not allowed_file(file.filename):
+        raise HTTPException(status_code=400, detail="File type not allowed")
 
-        processed_path, error = process_instrument(file_path)
+    job_id = secrets.token_hex(16)
+    file_path = f"{UPLOAD_DIR_PREFIX}{job_id}_{safe_filename(file.filename)}"
+    content_hash = await asyncio.to_thread(save_upload, file.file, file_path)
 
-        if error:
-            raise HTTPException(status_code=500, detail=f"An error occurred: {error}")
+    JOBS[job_id] = {
+        "status": "queued", "result": None, "error": None, "created": time.time()
+    }
+    task = asyncio.create_task(_run_job(job_id, file_path, content_hash))
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+    return {"id": job_id, "status": "queued"}
 
-        return FileResponse(processed_path, media_type='application/pdf', filename=os.path.basename(processed_path))
 
-    raise HTTPException(status_code=400, detail="File type not allowed")
+def expire_jobs(max_age: float = UPLOAD_MAX_AGE_SECONDS) -> int:
+    """
+    Forget finished jobs older than ``max_age`` seconds, the age at which the
+    janitor purges their files, and return how many were dropped.
+    """
+    cutoff = time.time() - max_age
+    expired = [
+        job_id for job_id, job in JOBS.items()
+        if job["status"] in ("done", "failed") and job["created"] < cutoff
+    ]
+    for job_id in expired:
+        del JOBS[job_id]
+    return len(expired)
+
+
+def _get_job(job_id: str) -> Dict[str, Any]:
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/status/{job_id}")
+async def job_status_endpoint(job_id: str):
+    job = _get_job(job_id)
+    return {"id": job_id, "status": job["status"], "error": job["error"]}
+
+
+@app.get("/result/{job_id}")
+async def job_result_endpoint(job_id: str):
+    job = _get_job(job_id)
+    if job["status"] == "failed":
+        raise HTTPException(status_code=500, detail=f"An error occurred: {job['error']}")
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail="Job is still processing")
+    processed_path, stat_result = job["result"]
+    # purge_stale_uploads may already have removed the stamped PDF
+    if not os.path.exists(processed_path):
+        raise HTTPException(status_code=410, detail="Job result has expired")
+    return stamped_pdf_response(processed_path, stat_result)
 
 
 @app.post("/scan-contract")
-def scan_contract_endpoint(contract: UploadFile = File(...)):
+async def scan_contract_endpoint(contract: UploadFile = File(...)):
     if not contract:
         raise HTTPException(status_code=400, detail="No file part")
     if contract.filename == "":
@@ -259,39 +382,37 @@ def scan_contract_endpoint(contract: UploadFile = File(...)):
     if not allowed_file(contract.filename):
         raise HTTPException(status_code=400, detail="Unsupported file type. Only PDF files are allowed.")
 
-    filename = secure_filename(contract.filename)
-    unique_filename = str(uuid.uuid4()) + os.path.splitext(filename)[1]
-    filepath = os.path.join(UPLOAD_FOLDER, unique_filename)
-    with open(filepath, "wb") as buffer:
-        buffer.write(contract.file.read())
+    filename = safe_filename(contract.filename)
+    unique_filename = secrets.token_hex(16) + os.path.splitext(filename)[1]
+    filepath = UPLOAD_DIR_PREFIX + unique_filename
+    await asyncio.to_thread(save_upload, contract.file, filepath)
 
     # Placeholder for clause scanner logic
     return {"output": "clausescanner.sh not found"}
 
 
-@app.post("/parse-sovereign-instrument")
-def parse_sovereign_instrument_endpoint(document: UploadFile = File(...)):
+@app.post("/parse-negotiable-instrument")
+async def parse_negotiable_instrument_endpoint(document: UploadFile = File(...)):
     if not document:
         raise HTTPException(status_code=400, detail="No document part")
     if document.filename == "":
         raise HTTPException(status_code=400, detail="No selected file")
 
-    unique_filename = str(uuid.uuid4()) + "_sovereign_doc.pdf"
-    filepath = os.path.join(UPLOAD_FOLDER, unique_filename)
-    with open(filepath, "wb") as buffer:
-        buffer.write(document.file.read())
+    # The upload is already spooled by Starlette (in memory, spilling to a
+    # temp file when large), so it is read in place rather than copied to
+    # UPLOAD_FOLDER and back.
+    from packages.LocalAgentCore.InstrumentClassifier.classifier import (
+        parse_negotiable_instrument,
+    )
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            document_content = f.read()
-
-        results = parse_sovereign_instrument(document_content)
+        document_text = await asyncio.to_thread(extract_document_text, document.file)
+        results = await asyncio.to_thread(parse_negotiable_instrument, document_text)
         return results
+    except APIError:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if os.path.exists(filepath):
-            os.remove(filepath)
+        raise handle_processing_error("instrument parsing", e)
 
 
 @app.post("/generate-remedy")
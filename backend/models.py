@@ -1,12 +1,25 @@
 """
-Pydantic models for API request/response validation
+Models for API request/response validation
+
+Request bodies and data parsed from documents are Pydantic models. Containers
+the API builds itself from already-validated values are slotted dataclasses:
+constructing them skips validation, while FastAPI still documents and checks
+them as response models through the ``Field`` metadata on each annotation.
 """
 
-from typing import List, Optional, Dict, Any
+import re
+from dataclasses import dataclass, field
+from typing import Annotated, List, Optional, Dict, Any
 from datetime import datetime
 from pydantic import BaseModel, Field, validator
 from enum import Enum
 
+CONTRACT_SCAN_TAGS = ('hidden_fee', 'misrepresentation', 'arbitration')
+_CONTRACT_SCAN_TAG_SET = frozenset(CONTRACT_SCAN_TAGS)
+# An optional leading "$", then digits with optional thousands commas and
+# decimal part, e.g. "$1,250.00"
+_AMOUNT_RE = re.compile(r"\s*\$?\s*(?:[0-9][0-9,]*(?:\.[0-9]+)?|\.[0-9]+)\s*")
+
 # Enums
 class InkColor(str, Enum):
     BLACK = "black"
@@ -44,12 +57,13 @@ class ErrorResponse(BaseModel):
     path: Optional[str] = None
 
 # Bill parsing models
-class BillLineItem(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class BillLineItem:
     """Individual line item in a bill"""
-    description: str = Field(..., description="Description of the line item")
-    amount: float = Field(..., ge=0, description="Amount for this line item")
-    quantity: Optional[int] = Field(None, ge=1, description="Quantity of items")
-    unit_price: Optional[float] = Field(None, ge=0, description="Price per unit")
+    description: Annotated[str, Field(description="Description of the line item")]
+    amount: Annotated[float, Field(ge=0, description="Amount for this line item")]
+    quantity: Annotated[Optional[int], Field(ge=1, description="Quantity of items")] = None
+    unit_price: Annotated[Optional[float], Field(ge=0, description="Price per unit")] = None
 
 class BillData(BaseModel):
     """Parsed bill information"""
@@ -65,13 +79,14 @@ class BillData(BaseModel):
     line_items: Optional[List[BillLineItem]] = Field(None, description="Individual line items")
 
 # Endorsement models
-class EndorsementDetails(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class EndorsementDetails:
     """Details of an endorsement applied to a bill"""
-    endorser_name: str = Field(..., description="Name of the person making the endorsement")
-    text: str = Field(..., description="Text of the endorsement")
-    signature: str = Field(..., description="Digital signature")
-    timestamp: datetime = Field(default_factory=datetime.now)
-    next_payee: Optional[str] = Field(None, description="Next payee in the chain")
+    endorser_name: Annotated[str, Field(description="Name of the person making the endorsement")]
+    text: Annotated[str, Field(description="Text of the endorsement")]
+    signature: Annotated[str, Field(description="Digital signature")]
+    timestamp: datetime = field(default_factory=datetime.now)
+    next_payee: Annotated[Optional[str], Field(description="Next payee in the chain")] = None
 
 class EndorsementOptions(BaseModel):
     """Options for bill endorsement"""
@@ -97,9 +112,8 @@ class ContractScanRequest(BaseModel):
 
     @validator('tag')
     def validate_tag(cls, v):
-        allowed_tags = ['hidden_fee', 'misrepresentation', 'arbitration']
-        if v not in allowed_tags:
-            raise ValueError(f'Tag must be one of: {", ".join(allowed_tags)}')
+        if v not in _CONTRACT_SCAN_TAG_SET:
+            raise ValueError(f'Tag must be one of: {", ".join(CONTRACT_SCAN_TAGS)}')
         return v
 
 class ContractScanResponse(BaseResponse):
@@ -129,9 +143,7 @@ class PTPLetterData(BaseModel):
 
     @validator('promise_amount')
     def validate_amount(cls, v):
-        try:
-            float(v.replace('$', '').replace(',', ''))
-        except ValueError:
+        if not _AMOUNT_RE.fullmatch(v):
             raise ValueError('Promise amount must be a valid monetary value')
         return v
 
@@ -144,6 +156,12 @@ class FCRALetterData(BaseModel):
     violation_template: str = Field(..., description="Violation template to use")
     selected_bureaus: List[CreditBureau] = Field(..., min_items=1, description="Credit bureaus to send dispute to")
 
+    @validator('selected_bureaus')
+    def dedupe_bureaus(cls, v):
+        # Members are already checked by the enum schema; drop repeats so a
+        # bureau is named once in the letter, keeping the caller's order.
+        return list(dict.fromkeys(v))
+
 class LetterGenerationRequest(BaseModel):
     """Request for letter generation"""
     letter_type: LetterType = Field(..., description="Type of letter to generate")
@@ -156,30 +174,37 @@ class LetterGenerationResponse(BaseResponse):
     generated_at: datetime = Field(default_factory=datetime.now)
 
 # File upload models
-class FileUploadResponse(BaseResponse):
+@dataclass(slots=True, kw_only=True)
+class FileUploadResponse:
     """Response from file upload"""
-    file_id: str = Field(..., description="Unique identifier for the uploaded file")
-    file_path: str = Field(..., description="Path to the uploaded file")
-    file_size: int = Field(..., ge=0, description="Size of the uploaded file in bytes")
-    content_type: str = Field(..., description="MIME type of the uploaded file")
+    message: str
+    file_id: Annotated[str, Field(description="Unique identifier for the uploaded file")]
+    file_path: Annotated[str, Field(description="Path to the uploaded file")]
+    file_size: Annotated[int, Field(ge=0, description="Size of the uploaded file in bytes")]
+    content_type: Annotated[str, Field(description="MIME type of the uploaded file")]
+    success: bool = True
+    timestamp: datetime = field(default_factory=datetime.now)
 
 # Health check model
-class HealthCheckResponse(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class HealthCheckResponse:
     """Health check response"""
-    status: str = Field("healthy", description="Service status")
-    timestamp: datetime = Field(default_factory=datetime.now)
-    version: str = Field("1.0.0", description="API version")
-    dependencies: Dict[str, str] = Field(default_factory=dict, description="Status of dependencies")
+    status: Annotated[str, Field(description="Service status")] = "healthy"
+    timestamp: datetime = field(default_factory=datetime.now)
+    version: Annotated[str, Field(description="API version")] = "1.0.0"
+    dependencies: Annotated[Dict[str, str], Field(description="Status of dependencies")] = field(default_factory=dict)
 
 # Configuration models
-class EndorsementConfig(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class EndorsementConfig:
     """Configuration for endorsements"""
-    trigger: str = Field(..., description="Trigger condition for this endorsement")
-    meaning: str = Field(..., description="Meaning or explanation of the endorsement")
-    ink_color: InkColor = Field(InkColor.BLUE, description="Default ink color")
-    placement: PlacementType = Field(PlacementType.FRONT, description="Default placement")
+    trigger: Annotated[str, Field(description="Trigger condition for this endorsement")]
+    meaning: Annotated[str, Field(description="Meaning or explanation of the endorsement")]
+    ink_color: Annotated[InkColor, Field(description="Default ink color")] = InkColor.BLUE
+    placement: Annotated[PlacementType, Field(description="Default placement")] = PlacementType.FRONT
 
-class SovereignOverlayConfig(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class SovereignOverlayConfig:
     """Configuration for sovereign overlay"""
-    sovereign_endorsements: List[EndorsementConfig] = Field(..., description="List of endorsement configurations")
-    default_settings: Dict[str, Any] = Field(default_factory=dict, description="Default settings")
\ No newline at end of file
+    sovereign_endorsements: Annotated[List[EndorsementConfig], Field(description="List of endorsement configurations")]
+    default_settings: Annotated[Dict[str, Any], Field(description="Default settings")] = field(default_factory=dict)
\ No newline at end of file
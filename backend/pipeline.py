@@ -0,0 +1,487 @@
+"""
+Upload handling and the OCR -> Parse -> Generate -> Stamp pipeline.
+
+Kept apart from the web layer so the shared BillParser, the extracted-text
+cache and the upload helpers are set up once, whichever app imports them.
+"""
+import asyncio
+import ctypes
+import functools
+import hashlib
+import logging
+import mmap
+import multiprocessing
+import os
+import re
+import secrets
+import tempfile
+import time
+from contextlib import ExitStack
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Tuple, Optional
+
+import pytesseract
+from pypdf import PdfReader, PdfWriter
+
+try:
+    import pymupdf
+except ImportError:  # PyMuPDF is optional; PDFium or pypdf is used without it
+    pymupdf = None
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # pypdfium2 is optional; pypdf is used without it
+    pdfium = None
+from werkzeug.utils import secure_filename
+
+# The LocalAgentCore packages (and reportlab behind the stamper) are imported
+# on first use so that worker start-up stays light; warm_up() loads them
+# before the first request.
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_FOLDER = "/tmp/uploads"
+ALLOWED_EXTENSIONS = frozenset({"pdf"})
+_ALLOWED_SUFFIXES = tuple("." + ext for ext in ALLOWED_EXTENSIONS)
+# Names werkzeug's secure_filename would return unchanged (ASCII word chars,
+# dots and dashes, no leading/trailing dot or underscore).
+_SAFE_FILENAME = re.compile(r"[A-Za-z0-9-](?:[A-Za-z0-9_.-]*[A-Za-z0-9-])?")
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Text-layer extractor, picked once at import from the fastest one installed.
+_EXTRACTOR = "pymupdf" if pymupdf is not None else "pdfium" if pdfium is not None else "pypdf"
+# Extracted text by content hash; entries expire with the uploads
+# (purge_stale_uploads).
+TEXT_CACHE_DIR = os.path.join(UPLOAD_FOLDER, ".textcache")
+# Directory prefixes for building per-request paths by concatenation; names
+# appended to them must already be sanitized (safe_filename, hex digests).
+UPLOAD_DIR_PREFIX = os.path.abspath(UPLOAD_FOLDER) + os.sep
+_TEXT_CACHE_PREFIX = os.path.abspath(TEXT_CACHE_DIR) + os.sep
+# 0 picks the OCR thread count from the CPU budget (see ocr_max_threads).
+OCR_MAX_THREADS = int(os.environ.get("OCR_MAX_THREADS", 0))
+PROCESS_POOL_WORKERS = os.cpu_count() or 1
+# OCR already runs one Tesseract process per batch; keep each of them from
+# also starting an OpenMP thread per core. pytesseract passes os.environ on.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+UPLOAD_MAX_AGE_SECONDS = int(os.environ.get("UPLOAD_MAX_AGE_SECONDS", 3600))
+if not os.path.exists(UPLOAD_FOLDER):
+    os.makedirs(UPLOAD_FOLDER)
+os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+
+
+# CPU-bound pure-Python stages go to worker processes while the app is
+# running, so concurrent requests aren't serialized on the GIL. The app's
+# lifespan starts and stops the pool; without one, work runs in a thread.
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def start_process_pool() -> None:
+    global _process_pool
+    _process_pool = ProcessPoolExecutor(max_workers=PROCESS_POOL_WORKERS)
+
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+async def run_in_process_pool(func, *args):
+    if _process_pool is None:
+        return await asyncio.to_thread(func, *args)
+    return await asyncio.get_running_loop().run_in_executor(_process_pool, func, *args)
+
+
+@functools.lru_cache(maxsize=None)
+def get_bill_parser():
+    """
+    Return the shared BillParser. It only holds precompiled patterns, so
+    one instance serves every request.
+    """
+    from packages.LocalAgentCore.InstrumentAnnotator.parser import BillParser
+
+    return BillParser()
+
+
+def new_content_hasher():
+    return hashlib.blake2b(digest_size=16)
+
+
+def save_upload(src, path: str) -> str:
+    """
+    Copy an upload stream to disk in fixed-size chunks, hashing each chunk
+    as it is written. Returns the content hash.
+    """
+    hasher = new_content_hasher()
+    with open(path, "wb", buffering=UPLOAD_CHUNK_SIZE) as dst:
+        for chunk in iter(lambda: src.read(UPLOAD_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+            dst.write(chunk)
+    return hasher.hexdigest()
+
+
+def allowed_file(filename: str) -> bool:
+    return filename.lower().endswith(_ALLOWED_SUFFIXES)
+
+
+@functools.lru_cache(maxsize=1024)
+def safe_filename(filename: str) -> str:
+    """``secure_filename`` with a fast path for names that are already safe."""
+    if os.name != "nt" and _SAFE_FILENAME.fullmatch(filename):
+        return filename
+    return secure_filename(filename)
+
+
+def _ocr_image_batch(work_dir: str, batch_number: int, image_paths: list) -> str:
+    """Run Tesseract once over a list file naming every image in the batch."""
+    list_path = os.path.join(work_dir, f"imglist_{batch_number}.txt")
+    with open(list_path, "w") as f:
+        f.write("\n".join(image_paths) + "\n")
+    return pytesseract.image_to_string(list_path, config="--psm 6")
+
+
+def _rewind(source):
+    """Seek a file-like PDF source back to the start; paths pass through."""
+    if not isinstance(source, str):
+        source.seek(0)
+    return source
+
+
+def _pymupdf_text(source, all_pages: bool) -> Tuple[int, str]:
+    with ExitStack() as stack:
+        if isinstance(source, str):
+            doc = pymupdf.open(source)
+        elif isinstance(source, mmap.mmap):
+            doc = pymupdf.open(stream=stack.enter_context(memoryview(source)), filetype="pdf")
+        else:
+            doc = pymupdf.open(stream=_rewind(source).read(), filetype="pdf")
+        with doc:
+            if doc.page_count == 0:
+                return 0, ""
+            if all_pages:
+                return doc.page_count, "\n".join(page.get_text("text") for page in doc)
+            return doc.page_count, doc.load_page(0).get_text("text")
+
+
+def extract_text_layer(
+    source, reader: Optional[PdfReader] = None, all_pages: bool = False
+) -> Tuple[int, str]:
+    """
+    Return the page count and the text layer of the first page, or of every
+    page joined by newlines when ``all_pages`` is set.
+
+    ``source`` is a file path or a seekable binary file. PyMuPDF or PDFium
+    does the extraction when installed (see _EXTRACTOR); pypdf is the
+    fallback, reusing ``reader`` when the caller already parsed the document.
+    """
+    if _EXTRACTOR == "pymupdf":
+        try:
+            return _pymupdf_text(source, all_pages)
+        except pymupdf.FileDataError:
+            logger.debug("PyMuPDF could not read the PDF; retrying with pypdf")
+    elif _EXTRACTOR == "pdfium":
+        if isinstance(source, mmap.mmap):
+            # Hand PDFium the mapped pages directly instead of a stream.
+            pdf = pdfium.PdfDocument((ctypes.c_char * len(source)).from_buffer(source))
+        else:
+            pdf = pdfium.PdfDocument(_rewind(source))
+        try:
+            page_count = len(pdf)
+            if page_count == 0:
+                return 0, ""
+            pages = pdf if all_pages else (pdf[0],)
+            return page_count, "\n".join(
+                page.get_textpage().get_text_range() for page in pages
+            )
+        finally:
+            pdf.close()
+
+    if reader is None:
+        reader = PdfReader(_rewind(source))
+    if len(reader.pages) == 0:
+        return 0, ""
+    pages = reader.pages if all_pages else reader.pages[:1]
+    return len(reader.pages), "\n".join(page.extract_text() for page in pages)
+
+
+def ocr_max_threads() -> int:
+    """
+    OCR_MAX_THREADS when set, otherwise every CPU, or this process's share
+    of them when running in a process-pool worker.
+    """
+    if OCR_MAX_THREADS > 0:
+        return OCR_MAX_THREADS
+    cpus = os.cpu_count() or 1
+    if multiprocessing.parent_process() is not None:
+        return max(1, cpus // PROCESS_POOL_WORKERS)
+    return cpus
+
+
+def ocr_page_images(reader: PdfReader) -> str:
+    """
+    OCR the images embedded in a scanned PDF.
+
+    The page images are written to a scratch directory and split into at
+    most ocr_max_threads() contiguous batches. Each batch is a single Tesseract
+    run over a list file, and the batches run on worker threads (Tesseract
+    runs as a subprocess, so the GIL is not held while it works). Text is
+    joined back in page order.
+    """
+    with tempfile.TemporaryDirectory(dir=UPLOAD_FOLDER) as work_dir:
+        image_paths = []
+        for page_number, page in enumerate(reader.pages):
+            for image_number, image_file in enumerate(page.images):
+                image_path = os.path.join(work_dir, f"page_{page_number}_{image_number}.png")
+                image_file.image.save(image_path)
+                image_paths.append(image_path)
+
+        if not image_paths:
+            return ""
+
+        workers = max(1, min(ocr_max_threads(), len(image_paths)))
+        batch_size = -(-len(image_paths) // workers)
+        batches = [
+            image_paths[i:i + batch_size]
+            for i in range(0, len(image_paths), batch_size)
+        ]
+        if len(batches) == 1:
+            return _ocr_image_batch(work_dir, 0, batches[0])
+
+        with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+            texts = executor.map(
+                lambda batch: _ocr_image_batch(work_dir, *batch), enumerate(batches)
+            )
+            return "\n".join(texts)
+
+
+def file_content_hash(source) -> str:
+    """Return the BLAKE2b digest of a file path's or binary file's contents."""
+    if isinstance(source, mmap.mmap):
+        hasher = new_content_hasher()
+        hasher.update(source)
+        return hasher.hexdigest()
+    if not isinstance(source, str):
+        return hashlib.file_digest(_rewind(source), new_content_hasher).hexdigest()
+    with open(source, "rb") as f:
+        return hashlib.file_digest(f, new_content_hasher).hexdigest()
+
+
+@functools.lru_cache(maxsize=256)
+def _read_cached_text(cache_key: str) -> str:
+    # Misses raise, and lru_cache doesn't cache exceptions, so only hits
+    # are kept in memory.
+    with open(f"{_TEXT_CACHE_PREFIX}{cache_key}.txt", "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def load_cached_text(cache_key: str) -> Optional[str]:
+    """Return previously extracted text for this cache key, if any."""
+    try:
+        return _read_cached_text(cache_key)
+    except FileNotFoundError:
+        return None
+
+
+def store_cached_text(cache_key: str, text: str) -> None:
+    """Save extracted text so identical uploads skip PDF parsing and OCR."""
+    cache_path = f"{_TEXT_CACHE_PREFIX}{cache_key}.txt"
+    tmp_path = f"{cache_path}.{secrets.token_hex(16)}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, cache_path)
+
+
+def extract_document_text(
+    source,
+    content_hash: Optional[str] = None,
+    reader: Optional[PdfReader] = None,
+    all_pages: bool = False,
+) -> str:
+    """
+    Return the text used to analyze an uploaded PDF, given as a file path or
+    a seekable binary file. An already-open ``reader`` for the same document
+    is reused instead of parsing it again.
+
+    Text comes from the content-hash cache when possible, otherwise from the
+    first page's text layer (every page's with ``all_pages``), with OCR of
+    the page images as a fallback. Returns an empty string when no text
+    could be recovered.
+
+    Raises:
+        APIError: If the PDF has no pages
+    """
+    from backend.error_handler import APIError, ErrorCode
+
+    if content_hash is None:
+        content_hash = file_content_hash(source)
+    # Whole-document text is cached apart from the first-page text
+    cache_key = f"{content_hash}.all" if all_pages else content_hash
+    raw_text = load_cached_text(cache_key)
+    if raw_text is None:
+        page_count, raw_text = extract_text_layer(source, reader, all_pages)
+        if page_count == 0:
+            raise APIError(
+                status_code=400,
+                error_code=ErrorCode.PROCESSING_ERROR,
+                message="PDF file contains no pages"
+            )
+
+        if not raw_text.strip():
+            logger.debug("No text layer found, attempting OCR")
+            try:
+                if reader is None:
+                    reader = PdfReader(_rewind(source))
+                raw_text = ocr_page_images(reader)
+            except pytesseract.TesseractNotFoundError:
+                logger.warning("Tesseract is not installed; skipping OCR")
+        if raw_text.strip():
+            store_cached_text(cache_key, raw_text)
+    return raw_text
+
+
+# --- Main Workflow ---
+def process_instrument(file_path: str, content_hash: Optional[str] = None) -> str:
+    """
+    Orchestrates the OCR -> Parse -> Generate -> Stamp workflow.
+    
+    Args:
+        file_path: Path to the PDF file to process
+        content_hash: Hash returned by save_upload; computed from the file
+            when not supplied
+        
+    Returns:
+        Path to the processed PDF file
+        
+    Raises:
+        APIError: If processing fails at any step
+    """
+    from backend.error_handler import APIError, ErrorCode, handle_processing_error
+    from packages.LocalAgentCore.InstrumentAnnotator.stamper import (
+        attach_endorsement_to_pdf_function,
+    )
+    from packages.LocalAgentCore.RemedyCompiler.engine import apply_endorsement
+    
+    logger.debug("Processing file: %s", file_path)
+
+    with ExitStack() as stack:
+        # 1. OCR: Extract text from PDF
+        try:
+            if not os.path.exists(file_path):
+                raise APIError(
+                    status_code=404,
+                    error_code=ErrorCode.NOT_FOUND,
+                    message="Input file not found",
+                    details=f"File path: {file_path}"
+                )
+            
+            # The file is mapped and parsed once here; extraction and stamping
+            # share the mapping and the reader. ACCESS_COPY only so ctypes can
+            # wrap the mapping for PDFium; nothing writes to it.
+            pdf_file = stack.enter_context(open(file_path, "rb"))
+            pdf_map = stack.enter_context(
+                mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_COPY)
+            )
+            reader = PdfReader(pdf_map)
+            raw_text = extract_document_text(pdf_map, content_hash, reader)
+            if not raw_text.strip():
+                raw_text = "OCR Placeholder: Account Number: 123 Amount Due: $456"
+            logger.debug("Extracted Text: %.200s...", raw_text)
+        except APIError:
+            raise
+        except Exception as e:
+            raise handle_processing_error("text extraction", e)
+
+        # 2. Parse: Use BillParser to get structured data
+        try:
+            bill_data = get_bill_parser().parse_bill(raw_text)
+            bill_data["recipient"] = "Daddy"
+            logger.debug("Parsed Bill Data: %s", bill_data)
+        except Exception as e:
+            raise handle_processing_error("bill parsing", e)
+
+        # 3. Generate: Create the endorsement
+        try:
+            remedy_text = "Conditional Acceptance for Value - UCC 1-308"
+            endorsed_bill = apply_endorsement(bill_data, "draft", remedy_text)
+            logger.debug("Generated Endorsement: %s", endorsed_bill["endorsements"])
+        except Exception as e:
+            raise handle_processing_error("endorsement generation", e)
+
+        # 4. Stamp: Apply the endorsement to the PDF
+        try:
+            output_path = f"{UPLOAD_DIR_PREFIX}processed_{os.path.basename(file_path)}"
+
+            attach_endorsement_to_pdf_function(
+                original_pdf_path=file_path,
+                endorsement_data=endorsed_bill,
+                output_pdf_path=output_path,
+                ink_color="blue",
+                page_index=0,  # Stamp on the first page
+                reader=reader,
+            )
+
+            logger.debug("Stamped PDF created at: %s", output_path)
+            return output_path
+        except Exception as e:
+            raise handle_processing_error("PDF stamping", e)
+
+
+def process_instrument_with_stat(
+    file_path: str, content_hash: Optional[str] = None
+) -> Tuple[str, os.stat_result]:
+    """
+    Run process_instrument and stat the stamped PDF in the same worker, so
+    the response can reuse the result instead of stat'ing the file again.
+    """
+    output_path = process_instrument(file_path, content_hash)
+    return output_path, os.stat(output_path)
+
+
+def _purge_stale_files(directory: str, cutoff: float) -> int:
+    removed = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def purge_stale_uploads(max_age: float = UPLOAD_MAX_AGE_SECONDS) -> int:
+    """
+    Delete files in UPLOAD_FOLDER and the text cache not modified within
+    ``max_age`` seconds and return how many were removed, so extracted text
+    does not outlive the uploads it came from. Other subdirectories, such as
+    in-progress OCR scratch space, are left alone.
+    """
+    cutoff = time.time() - max_age
+    removed = _purge_stale_files(UPLOAD_FOLDER, cutoff)
+    purged_text = _purge_stale_files(TEXT_CACHE_DIR, cutoff)
+    if purged_text:
+        # Don't keep serving purged text from this process's memory
+        _read_cached_text.cache_clear()
+    return removed + purged_text
+
+
+def warm_up() -> None:
+    """
+    Import the lazily loaded modules and exercise the parser and PDF text
+    extraction once, so the first real request doesn't pay for lazy
+    initialization. Failures are only logged.
+    """
+    try:
+        from packages.LocalAgentCore.InstrumentAnnotator import stamper  # noqa: F401
+        from packages.LocalAgentCore.InstrumentClassifier import classifier  # noqa: F401
+
+        get_bill_parser().parse_bill("Account Number: 0 Amount Due: $0")
+        buffer = BytesIO()
+        writer = PdfWriter()
+        writer.add_blank_page(width=72, height=72)
+        writer.write(buffer)
+        extract_text_layer(buffer)
+    except Exception:
+        logger.debug("Pipeline warm-up failed", exc_info=True)
@@ -1,28 +1,53 @@
-import os
-import sys
+from collections import OrderedDict
 
 from pydantic import BaseModel
 
 from fastapi import APIRouter
 
+from backend.pipeline import new_content_hasher
 from packages.LocalAgentCore.InstrumentAnnotator.parse_layout import parse_layout
 from packages.LocalAgentCore.InstrumentAnnotator.suggest_endorsements import suggest_endorsements
 from packages.LocalAgentCore.InstrumentAnnotator.tag_zones import tag_zones
 
 router = APIRouter()
 
+_ANNOTATE_CACHE_MAX_ENTRIES = 512
+# text digest -> (tags, endorsements). Only the tagged lines are kept, never
+# the submitted text, so the cache stays small however large the documents.
+_annotate_cache = OrderedDict()
+
 
 class AnnotatorRequest(BaseModel):
     text: str
 
 
+def _annotate(text: str) -> dict:
+    # The chain is a pure function of the text, and wizard clients resubmit
+    # the same document while tweaking other fields. Splitting the layout is
+    # cheap, so only the tagging and suggestions are cached. Callers must not
+    # mutate the cached parts of the result.
+    layout = parse_layout(text)
+    hasher = new_content_hasher()
+    hasher.update(text.encode("utf-8", "surrogatepass"))
+    key = hasher.digest()
+
+    entry = _annotate_cache.get(key)
+    if entry is not None:
+        _annotate_cache.move_to_end(key)
+    else:
+        tags = tag_zones(layout)
+        entry = (tags, suggest_endorsements(tags))
+        _annotate_cache[key] = entry
+        if len(_annotate_cache) > _ANNOTATE_CACHE_MAX_ENTRIES:
+            _annotate_cache.popitem(last=False)
+
+    tags, endorsements = entry
+    return {"layout": layout, "tags": tags, "endorsements": endorsements}
+
+
 @router.post("/api/wizard/annotate")
 async def annotate_instrument(request: AnnotatorRequest):
     """
     Analyzes an instrument's text and returns layout, tags, and endorsement suggestions.
     """
-    layout = parse_layout(request.text)
-    tags = tag_zones(layout)
-    endorsements = suggest_endorsements(tags)
-
-    return {"layout": layout, "tags": tags, "endorsements": endorsements}
+    return _annotate(request.text)
@@ -1,19 +1,19 @@
-import os
-import sys
+from pydantic import BaseModel
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter
 
 from packages.LocalAgentCore.DebtDischargeKit.logic.parse_statement import parse_statement
 
 router = APIRouter()
 
 
-@router.post("/api/wizard/discharge")
-async def discharge_context(request: Request):
-    body = await request.json()
-    user_input = body.get("input", "")
+class DischargeRequest(BaseModel):
+    input: str = ""
+
 
-    flags = parse_statement(user_input)
+@router.post("/api/wizard/discharge")
+async def discharge_context(request: DischargeRequest):
+    flags = parse_statement(request.input)
 
     # For now, we'll just return the flags.
     # We can add more logic later to generate the discharge instrument.
@@ -2,7 +2,12 @@
 Document processing routes
 """
 
+import asyncio
 import os
+import re
+import secrets
+from typing import Dict, List, Tuple
+
 from fastapi import APIRouter, File, UploadFile, Form, HTTPException
 from backend.error_handler import APIError, ErrorCode, validate_file_upload
 from backend.models import (
@@ -10,16 +15,41 @@ from backend.models import (
     ContractScanRequest,
     FileUploadResponse
 )
+from backend.pipeline import extract_document_text, save_upload
 
 router = APIRouter()
 
+UPLOAD_DIR = "uploads"
+
 # Mock keyword map - in production this would be loaded from configuration
-KEYWORD_MAP = {
-    "hidden_fee": ["convenience fee", "service charge", "processing fee", "undisclosed", "surcharge"],
-    "misrepresentation": ["misrepresented", "misleading", "deceptive", "false statement", "inaccurate"],
-    "arbitration": ["arbitration", "arbitrator", "binding arbitration", "waive your right to"]
+KEYWORD_MAP: Dict[str, Tuple[str, ...]] = {
+    "hidden_fee": ("convenience fee", "service charge", "processing fee", "undisclosed", "surcharge"),
+    "misrepresentation": ("misrepresented", "misleading", "deceptive", "false statement", "inaccurate"),
+    "arbitration": ("arbitration", "arbitrator", "binding arbitration", "waive your right to"),
 }
 
+# One alternation per tag, longest keywords first, so a single pass over the
+# text finds every keyword of that tag.
+KEYWORD_PATTERNS = {
+    tag: re.compile(
+        r"\b(?:%s)\b" % "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)),
+        re.IGNORECASE,
+    )
+    for tag, keywords in KEYWORD_MAP.items()
+}
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+
+def find_tagged_clauses(text: str, tag: str) -> List[str]:
+    """Return the sentences of ``text`` that contain a keyword for ``tag``."""
+    pattern = KEYWORD_PATTERNS[tag]
+    clauses = []
+    for sentence in _SENTENCE_SPLIT.split(" ".join(text.split())):
+        if pattern.search(sentence):
+            clauses.append(sentence)
+    return clauses
+
 @router.post("/scan-contract", response_model=ContractScanResponse)
 async def scan_contract_for_terms(
     contract: UploadFile = File(..., description="PDF contract to scan"),
@@ -58,24 +88,9 @@ async def scan_contract_for_terms(
         )
     
     try:
-        # Read file content
-        content = await contract.read()
-        
-        # In a real implementation, this would use proper PDF parsing and NLP
-        # For now, we'll return a mock response
-        keywords = KEYWORD_MAP[tag]
-        found_clauses = []
-        
-        # Mock processing - in reality would parse PDF and search text
-        if tag == "hidden_fee":
-            found_clauses = [
-                "A convenience fee of $2.95 will be charged for online payments.",
-                "Processing fees may apply to certain transaction types."
-            ]
-        elif tag == "arbitration":
-            found_clauses = [
-                "Any disputes arising from this agreement shall be resolved through binding arbitration."
-            ]
+        # Clauses can be anywhere in a contract, so scan every page
+        text = await asyncio.to_thread(extract_document_text, contract.file, all_pages=True)
+        found_clauses = find_tagged_clauses(text, tag)
         
         return ContractScanResponse(
             message=f"Contract scanned successfully for {tag} terms",
@@ -114,25 +129,19 @@ async def upload_document(
     validate_file_upload(file, max_size_mb=10)
     
     # Generate unique file ID
-    import uuid
-    file_id = str(uuid.uuid4())
+    file_id = secrets.token_hex(16)
     
     # Save file (mock implementation)
-    upload_dir = "uploads"
-    os.makedirs(upload_dir, exist_ok=True)
-    
-    file_path = os.path.join(upload_dir, f"{file_id}_{file.filename}")
+    file_path = os.path.join(UPLOAD_DIR, f"{file_id}_{file.filename}")
     
     try:
-        content = await file.read()
-        with open(file_path, "wb") as buffer:
-            buffer.write(content)
+        await asyncio.to_thread(save_upload, file.file, file_path)
         
         return FileUploadResponse(
             message="File uploaded successfully",
             file_id=file_id,
             file_path=file_path,
-            file_size=len(content),
+            file_size=os.path.getsize(file_path),
             content_type=file.content_type or "application/octet-stream"
         )
         
@@ -1,7 +1,11 @@
 
+import asyncio
+import logging
 import os
-import uuid
+import secrets
+from datetime import datetime
 from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Form
+from backend.config import load_private_key
 from backend.error_handler import APIError, ErrorCode, validate_file_upload
 from backend.models import (
     EndorsementResponse, 
@@ -13,12 +17,13 @@ from backend.models import (
     PlacementType
 )
 
-from packages.EndorserKit.bill_parser import BillParser
-from packages.EndorserKit.endorsement_engine import prepare_endorsement_for_signing
-from packages.EndorserKit.ucc3_endorsements import sign_endorsement
-from packages.EndorserKit.remedy_logger import log_remedy
-from packages.EndorserKit.attach_endorsement_to_pdf import attach_endorsement_to_pdf_function
-from packages.EndorserKit.utils import load_yaml_config
+from backend.pipeline import run_in_process_pool, save_upload
+
+# pypdf and the EndorserKit modules (and cryptography, yaml and reportlab
+# behind them) are imported on first use, inside the process that does the
+# endorsing, so importing this router stays light.
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -27,17 +32,158 @@ SOVEREIGN_OVERLAY_CONFIG = "config/sovereign_overlay.yaml"
 UPLOAD_DIR = "uploads"
 KEY_FILE = "private_key.pem"
 
+def get_sovereign_endorsements():
+    """The configured endorsements, reparsed only when the file changes."""
+    from packages.EndorserKit.utils import cached_load_yaml
+
+    overlay_config = cached_load_yaml(SOVEREIGN_OVERLAY_CONFIG)
+    return overlay_config.get("sovereign_endorsements", [])
+
 def get_private_key():
     """Loads the private key from environment variable or file."""
-    key_from_env = os.environ.get("PRIVATE_KEY_PEM")
-    if key_from_env:
-        return key_from_env
-    
-    if os.path.exists(KEY_FILE):
-        with open(KEY_FILE, 'r') as f:
-            return f.read()
-            
-    return None
+    return load_private_key(KEY_FILE)
+
+def endorse_bill_file(filepath, filename, private_key_pem, ink_color, placement):
+    """
+    Parse the saved bill, then sign, log and stamp every configured
+    endorsement. Returns ``(bill_data, endorsed_files, endorsements)``.
+
+    This is the CPU-bound part of /endorse-bill/, run in the process pool,
+    so its arguments and results must stay picklable.
+    """
+    from pypdf import PdfReader
+
+    from packages.EndorserKit.attach_endorsement_to_pdf import attach_endorsement_to_pdf_function
+    from packages.EndorserKit.bill_parser import BillParser
+    from packages.EndorserKit.endorsement_engine import prepare_endorsement_for_signing
+    from packages.EndorserKit.remedy_logger import log_remedy
+    from packages.EndorserKit.ucc3_endorsements import sign_endorsements_batch
+
+    # 1. Parse the bill
+    try:
+        bill_data = BillParser.get_bill_data_from_source(filepath)
+        if "error" in bill_data:
+            raise APIError(
+                status_code=400,
+                error_code=ErrorCode.PROCESSING_ERROR,
+                message="Failed to parse bill data",
+                details=bill_data["error"]
+            )
+    except APIError:
+        raise
+    except Exception as e:
+        raise APIError(
+            status_code=500,
+            error_code=ErrorCode.PROCESSING_ERROR,
+            message="Error during bill parsing",
+            details=str(e)
+        )
+
+    # 2. Load endorsement rules
+    try:
+        sovereign_endorsements = get_sovereign_endorsements()
+    except Exception as e:
+        raise APIError(
+            status_code=500,
+            error_code=ErrorCode.PROCESSING_ERROR,
+            message="Failed to load endorsement configuration",
+            details=str(e)
+        )
+
+    if not sovereign_endorsements:
+        return bill_data, [], []
+
+    # 3. Process and attach endorsements
+    endorsed_files = []
+    applied_endorsements = []
+    # Every endorsement stamps the same source, so parse it only once
+    reader = PdfReader(filepath)
+    # ...and is applied in the same request, so shares one timestamp
+    endorsed_at = datetime.now()
+
+    endorsement_texts = [
+        f"{endorsement_type.get('trigger', 'Unknown')}: {endorsement_type.get('meaning', '')}"
+        for endorsement_type in sovereign_endorsements
+    ]
+    # Every endorsement is signed with the same key, so sign them as one batch
+    signed_endorsements = sign_endorsements_batch(
+        [prepare_endorsement_for_signing(bill_data, text) for text in endorsement_texts],
+        endorser_name=bill_data.get("customer_name", "N/A"),
+        private_key_pem=private_key_pem
+    )
+    # The bill fields logged with every endorsement are the same each time
+    base_bill_for_logging = {
+        "instrument_id": bill_data.get("bill_number"),
+        "issuer": bill_data.get("issuer", "Unknown"),
+        "recipient": bill_data.get("customer_name"),
+        "amount": bill_data.get("total_amount"),
+        "currency": bill_data.get("currency"),
+        "description": bill_data.get("description", "N/A"),
+    }
+    filename_stem = os.path.splitext(filename)[0]
+
+    for endorsement_type, endorsement_text, signed_endorsement in zip(
+        sovereign_endorsements, endorsement_texts, signed_endorsements
+    ):
+        trigger = endorsement_type.get("trigger", "Unknown")
+
+        # Prepare data for logging and PDF attachment
+        bill_for_logging = {
+            **base_bill_for_logging,
+            "endorsements": [{
+                "endorser_name": signed_endorsement.get("endorser_id"),
+                "text": endorsement_text,
+                "next_payee": "Original Creditor", # Placeholder
+                "signature": signed_endorsement["signature"]
+            }],
+            "signature_block": {
+                "signed_by": signed_endorsement.get("endorser_id"),
+                "capacity": "Payer", # Placeholder
+                "signature": signed_endorsement["signature"],
+                "date": signed_endorsement.get("endorsement_date")
+            }
+        }
+
+        # Log the remedy
+        log_remedy(bill_for_logging)
+
+        # Attach endorsement to a new PDF
+        output_pdf_name = f"endorsed_{filename_stem}_{trigger.replace(' ', '')}.pdf"
+        endorsed_output_path = os.path.join(UPLOAD_DIR, output_pdf_name)
+
+        logger.debug(
+            "Attaching endorsement %s (config ink color %s): endorsements=%s signature_block=%s",
+            trigger,
+            endorsement_type.get("ink_color", "black"),
+            bill_for_logging["endorsements"],
+            bill_for_logging["signature_block"],
+        )
+
+        # Use the form parameters for ink color and placement, with fallback to config
+        effective_ink_color = ink_color.value if ink_color else endorsement_type.get("ink_color", "blue")
+        effective_placement = placement.value if placement else endorsement_type.get("placement", "front")
+
+        attach_endorsement_to_pdf_function(
+            original_pdf_path=filepath,
+            endorsement_data=bill_for_logging,
+            output_pdf_path=endorsed_output_path,
+            ink_color=effective_ink_color,
+            page_index=0 if effective_placement.lower() == "front" else -1,
+            reader=reader
+        )
+        endorsed_files.append(endorsed_output_path)
+
+        # Create endorsement detail for response
+        endorsement_detail = EndorsementDetails(
+            endorser_name=signed_endorsement.get("endorser_id", "N/A"),
+            text=endorsement_text,
+            signature=signed_endorsement["signature"],
+            timestamp=endorsed_at,
+            next_payee="Original Creditor"
+        )
+        applied_endorsements.append(endorsement_detail)
+
+    return bill_data, endorsed_files, applied_endorsements
 
 @router.post("/endorse-bill/", response_model=EndorsementResponse)
 async def endorse_bill(
@@ -91,17 +237,6 @@ async def endorse_bill(
             details="Run 'python scripts/generate_key.py' or set the PRIVATE_KEY_PEM environment variable"
         )
 
-    # Ensure upload directory exists
-    try:
-        os.makedirs(UPLOAD_DIR, exist_ok=True)
-    except Exception as e:
-        raise APIError(
-            status_code=500,
-            error_code=ErrorCode.INTERNAL_SERVER_ERROR,
-            message="Failed to create upload directory",
-            details=str(e)
-        )
-
     # Save uploaded file securely
     if not file.filename:
         raise APIError(
@@ -110,13 +245,11 @@ async def endorse_bill(
             message="File must have a filename"
         )
         
-    filename = str(uuid.uuid4()) + os.path.splitext(file.filename)[1]
+    filename = secrets.token_hex(16) + os.path.splitext(file.filename)[1]
     filepath = os.path.join(UPLOAD_DIR, filename)
     
     try:
-        content = await file.read()
-        with open(filepath, "wb") as buffer:
-            buffer.write(content)
+        await asyncio.to_thread(save_upload, file.file, filepath)
     except Exception as e:
         raise APIError(
             status_code=500,
@@ -126,121 +259,22 @@ async def endorse_bill(
         )
 
     try:
-        # 1. Parse the bill
-        try:
-            bill_data = BillParser.get_bill_data_from_source(filepath)
-            if "error" in bill_data:
-                raise APIError(
-                    status_code=400,
-                    error_code=ErrorCode.PROCESSING_ERROR,
-                    message="Failed to parse bill data",
-                    details=bill_data["error"]
-                )
-        except APIError:
-            raise
-        except Exception as e:
-            raise APIError(
-                status_code=500,
-                error_code=ErrorCode.PROCESSING_ERROR,
-                message="Error during bill parsing",
-                details=str(e)
-            )
-
-        # 2. Load endorsement rules
-        try:
-            overlay_config = load_yaml_config(SOVEREIGN_OVERLAY_CONFIG)
-            sovereign_endorsements = overlay_config.get("sovereign_endorsements", [])
-        except Exception as e:
-            raise APIError(
-                status_code=500,
-                error_code=ErrorCode.PROCESSING_ERROR,
-                message="Failed to load endorsement configuration",
-                details=str(e)
-            )
+        bill_data, endorsed_files, applied_endorsements = await run_in_process_pool(
+            endorse_bill_file, filepath, filename, private_key_pem, ink_color, placement
+        )
 
-        if not sovereign_endorsements:
-            return EndorsementResponse(
+        # Everything below is already validated (BillData still checks the
+        # parser output), and FastAPI validates the return value against
+        # response_model, so the response itself is built without validation.
+        if not applied_endorsements:
+            return EndorsementResponse.model_construct(
                 message="Bill processed, but no applicable endorsements found in config.",
                 endorsed_files=[],
                 bill_data=BillData(**bill_data) if bill_data else None,
                 endorsements=[]
             )
 
-        # 3. Process and attach endorsements
-        endorsed_files = []
-        applied_endorsements = []
-        
-        for endorsement_type in sovereign_endorsements:
-            trigger = endorsement_type.get("trigger", "Unknown")
-            
-            endorsement_text = f"{trigger}: {endorsement_type.get('meaning', '')}"
-            endorsement_to_sign = prepare_endorsement_for_signing(bill_data, endorsement_text)
-
-            # Sign the endorsement
-            signed_endorsement = sign_endorsement(
-                endorsement_data=endorsement_to_sign,
-                endorser_name=bill_data.get("customer_name", "N/A"),
-                private_key_pem=private_key_pem
-            )
-
-            # Prepare data for logging and PDF attachment
-            bill_for_logging = {
-                "instrument_id": bill_data.get("bill_number"),
-                "issuer": bill_data.get("issuer", "Unknown"),
-                "recipient": bill_data.get("customer_name"),
-                "amount": bill_data.get("total_amount"),
-                "currency": bill_data.get("currency"),
-                "description": bill_data.get("description", "N/A"),
-                "endorsements": [{
-                    "endorser_name": signed_endorsement.get("endorser_id"),
-                    "text": endorsement_text,
-                    "next_payee": "Original Creditor", # Placeholder
-                    "signature": signed_endorsement["signature"]
-                }],
-                "signature_block": {
-                    "signed_by": signed_endorsement.get("endorser_id"),
-                    "capacity": "Payer", # Placeholder
-                    "signature": signed_endorsement["signature"],
-                    "date": signed_endorsement.get("endorsement_date")
-                }
-            }
-
-            # Log the remedy
-            log_remedy(bill_for_logging)
-
-            # Attach endorsement to a new PDF
-            output_pdf_name = f"endorsed_{filename.replace('.pdf', '')}_{trigger.replace(' ', '')}.pdf"
-            endorsed_output_path = os.path.join(UPLOAD_DIR, output_pdf_name)
-
-            print(f"🔍 DEBUG - Endorsement data being attached:")
-            print(f"   Endorsements: {bill_for_logging.get('endorsements')}")
-            print(f"   Signature block: {bill_for_logging.get('signature_block')}")
-            print(f"   Trigger: {trigger}")
-            print(f"   Ink color: {endorsement_type.get('ink_color', 'black')}")
-
-            # Use the form parameters for ink color and placement, with fallback to config
-            effective_ink_color = ink_color.value if ink_color else endorsement_type.get("ink_color", "blue")
-            effective_placement = placement.value if placement else endorsement_type.get("placement", "front")
-            
-            attach_endorsement_to_pdf_function(
-                original_pdf_path=filepath,
-                endorsement_data=bill_for_logging,
-                output_pdf_path=endorsed_output_path,
-                ink_color=effective_ink_color,
-                page_index=0 if effective_placement.lower() == "front" else -1
-            )
-            endorsed_files.append(endorsed_output_path)
-            
-            # Create endorsement detail for response
-            endorsement_detail = EndorsementDetails(
-                endorser_name=signed_endorsement.get("endorser_id", "N/A"),
-                text=endorsement_text,
-                signature=signed_endorsement["signature"],
-                next_payee="Original Creditor"
-            )
-            applied_endorsements.append(endorsement_detail)
-
-        return EndorsementResponse(
+        return EndorsementResponse.model_construct(
             message="Bill endorsed successfully",
             endorsed_files=endorsed_files,
             bill_data=BillData(**bill_data) if bill_data else None,
@@ -12,14 +12,24 @@ from backend.models import (
     FCRALetterData,
     LetterType
 )
-from datetime import datetime
-from typing import Dict, Any
+from datetime import date
+from typing import Callable, Dict, Any, Tuple, Type
+import functools
+from pydantic import BaseModel
 
 router = APIRouter()
 
+@functools.lru_cache(maxsize=1)
+def _format_letter_date(day_ordinal: int) -> str:
+    return date.fromordinal(day_ordinal).strftime("%B %d, %Y")
+
+def letter_date() -> str:
+    """Today's date as written in letters; formatted once per day."""
+    return _format_letter_date(date.today().toordinal())
+
 def generate_tender_letter(data: TenderLetterData) -> str:
     """Generate a tender letter based on provided data"""
-    current_date = datetime.now().strftime("%B %d, %Y")
+    current_date = letter_date()
     
     letter_content = f"""
 {data.user_name}
@@ -51,7 +61,7 @@ Sincerely,
 
 def generate_ptp_letter(data: PTPLetterData) -> str:
     """Generate a promise to pay letter based on provided data"""
-    current_date = datetime.now().strftime("%B %d, %Y")
+    current_date = letter_date()
     
     letter_content = f"""
 {data.user_name}
@@ -81,7 +91,7 @@ Sincerely,
 
 def generate_fcra_letter(data: FCRALetterData) -> str:
     """Generate an FCRA dispute letter based on provided data"""
-    current_date = datetime.now().strftime("%B %d, %Y")
+    current_date = letter_date()
     
     bureaus_text = ", ".join([bureau.value.title() for bureau in data.selected_bureaus])
     
@@ -211,6 +221,13 @@ async def generate_fcra_letter_endpoint(data: FCRALetterData) -> LetterGeneratio
             details=str(e)
         )
 
+# Request data model and generator for each letter type
+_GENERATORS: Dict[LetterType, Tuple[Type[BaseModel], Callable[[Any], str]]] = {
+    LetterType.TENDER: (TenderLetterData, generate_tender_letter),
+    LetterType.PTP: (PTPLetterData, generate_ptp_letter),
+    LetterType.FCRA: (FCRALetterData, generate_fcra_letter),
+}
+
 @router.post("/generate-letter", response_model=LetterGenerationResponse)
 async def generate_letter_generic(request: LetterGenerationRequest) -> LetterGenerationResponse:
     """
@@ -223,21 +240,15 @@ async def generate_letter_generic(request: LetterGenerationRequest) -> LetterGen
     - Generated letter content based on the requested type
     """
     try:
-        if request.letter_type == LetterType.TENDER:
-            data = TenderLetterData(**request.data)
-            letter_content = generate_tender_letter(data)
-        elif request.letter_type == LetterType.PTP:
-            data = PTPLetterData(**request.data)
-            letter_content = generate_ptp_letter(data)
-        elif request.letter_type == LetterType.FCRA:
-            data = FCRALetterData(**request.data)
-            letter_content = generate_fcra_letter(data)
-        else:
+        generator = _GENERATORS.get(request.letter_type)
+        if generator is None:
             raise APIError(
                 status_code=400,
                 error_code=ErrorCode.VALIDATION_ERROR,
                 message=f"Unsupported letter type: {request.letter_type}"
             )
+        data_model, generate = generator
+        letter_content = generate(data_model(**request.data))
         
         return LetterGenerationResponse(
             message=f"{request.letter_type.value.title()} letter generated successfully",
@@ -1,7 +1,6 @@
-import os
-import sys
+from pydantic import BaseModel
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter
 
 from packages.LocalAgentCore.NationalityReclaimer.logic.generate_affidavit import generate_affidavit
 from packages.LocalAgentCore.NationalityReclaimer.logic.parse_nationality import parse_nationality
@@ -9,14 +8,15 @@ from packages.LocalAgentCore.NationalityReclaimer.logic.parse_nationality import
 router = APIRouter()
 
 
-@router.post("/api/wizard/nationality")
-async def nationality_context(request: Request):
-    body = await request.json()
-    user_input = body.get("input", "")
+class NationalityRequest(BaseModel):
+    input: str = ""
+    full_name: str = "John Doe"
+    birth_location: str = "Alabama Republic"
+
 
-    parsed = parse_nationality(user_input)
-    full_name = body.get("full_name", "John Doe")
-    birth_location = body.get("birth_location", "Alabama Republic")
+@router.post("/api/wizard/nationality")
+async def nationality_context(request: NationalityRequest):
+    parsed = parse_nationality(request.input)
 
     affidavit = generate_affidavit(
         nationality=(
@@ -24,8 +24,8 @@ async def nationality_context(request: Request):
             if parsed["suggested_nationalities"]
             else "American State National"
         ),
-        full_name=full_name,
-        birth_location=birth_location,
+        full_name=request.full_name,
+        birth_location=request.birth_location,
     )
 
     return {
@@ -1,7 +1,6 @@
-import os
-import sys
+from pydantic import BaseModel
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter
 
 from packages.LocalAgentCore.DebtDischargeKit.logic.generate_discharge_instrument import generate_discharge_instrument
 from packages.LocalAgentCore.InstrumentAnnotator.parse_layout import parse_layout
@@ -11,14 +10,21 @@ from packages.LocalAgentCore.InstrumentAnnotator.tag_zones import tag_zones
 router = APIRouter()
 
 
+class PacketRequest(BaseModel):
+    full_name: str = "Daddy"
+    statement_id: str = "123456789"
+    amount: str = "$1,245.67"
+    creditor: str = "XYZ Utility Corp"
+    billing_text: str = ""
+
+
 @router.post("/api/wizard/packet")
-async def generate_packet(request: Request):
-    body = await request.json()
-    full_name = body.get("full_name", "Daddy")
-    statement_id = body.get("statement_id", "123456789")
-    amount = body.get("amount", "$1,245.67")
-    creditor = body.get("creditor", "XYZ Utility Corp")
-    billing_text = body.get("billing_text", "")
+async def generate_packet(request: PacketRequest):
+    full_name = request.full_name
+    statement_id = request.statement_id
+    amount = request.amount
+    creditor = request.creditor
+    billing_text = request.billing_text
 
     endorsement = generate_discharge_instrument(
         full_name, statement_id, amount, creditor
@@ -58,16 +64,13 @@ async def generate_packet(request: Request):
     tags = tag_zones(layout)
     endorsement_suggestions = suggest_endorsements(tags)
 
-    placement_guide = ""
-    for suggestion in endorsement_suggestions:
-        placement_guide += (
-            f"- {suggestion['zone'].capitalize()} Zone: _{suggestion['action']}_\n\n"
-        )
+    placement_guide = "\n\n".join(
+        f"- {suggestion['zone'].capitalize()} Zone: _{suggestion['action']}_"
+        for suggestion in endorsement_suggestions
+    )
 
     return {
-        {
-            "cover_letter": cover_letter,
-            "endorsement": endorsement,
-            "placement_guide": placement_guide.strip(),
-        }
+        "cover_letter": cover_letter,
+        "endorsement": endorsement,
+        "placement_guide": placement_guide,
     }
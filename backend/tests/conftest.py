@@ -0,0 +1,13 @@
+from io import BytesIO
+
+import pytest
+from pypdf import PdfWriter
+
+@pytest.fixture
+def blank_pdf():
+    """The bytes of a one-page blank PDF."""
+    buffer = BytesIO()
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    writer.write(buffer)
+    return buffer.getvalue()
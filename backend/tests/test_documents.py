@@ -0,0 +1,35 @@
+from io import BytesIO
+
+from fastapi.testclient import TestClient
+from reportlab.pdfgen import canvas
+
+from backend.main import app
+from backend.routes.documents import find_tagged_clauses
+
+def test_find_tagged_clauses_returns_matching_sentences():
+    """Tests that only sentences containing a tag keyword are returned."""
+    text = "Payment is due monthly.\nA processing fee applies. Disputes go to arbitration!"
+    assert find_tagged_clauses(text, "hidden_fee") == ["A processing fee applies."]
+    assert find_tagged_clauses(text, "arbitration") == ["Disputes go to arbitration!"]
+
+def test_find_tagged_clauses_no_match():
+    """Tests that a contract without the tag's keywords yields no clauses."""
+    assert find_tagged_clauses("Nothing to see here.", "arbitration") == []
+
+def test_scan_contract_searches_every_page():
+    """Tests that clauses past the first page are found."""
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer)
+    pdf.drawString(72, 720, "Payment is due monthly.")
+    pdf.showPage()
+    pdf.drawString(72, 720, "Disputes are settled by binding arbitration.")
+    pdf.showPage()
+    pdf.save()
+
+    response = TestClient(app).post(
+        "/api/scan-contract",
+        files={"contract": ("contract.pdf", buffer.getvalue(), "application/pdf")},
+        data={"tag": "arbitration"},
+    )
+    assert response.status_code == 200
+    assert response.json()["found_clauses"] == ["Disputes are settled by binding arbitration."]
@@ -0,0 +1,52 @@
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+from fastapi.testclient import TestClient
+from starlette.datastructures import Headers
+
+from backend.error_handler import APIError, validate_file_upload
+from backend.main import app
+
+def make_upload(content, content_type="application/pdf", size=None):
+    return UploadFile(
+        BytesIO(content),
+        size=size,
+        filename="bill.pdf",
+        headers=Headers({"content-type": content_type}),
+    )
+
+def test_accepts_pdf():
+    """Tests that a small PDF passes and is left rewound."""
+    upload = make_upload(b"%PDF-1.7\n...")
+    validate_file_upload(upload)
+    assert upload.file.tell() == 0
+
+def test_rejects_oversized_file():
+    """Tests that files over the limit are refused with 413."""
+    with pytest.raises(APIError) as excinfo:
+        validate_file_upload(make_upload(b"%PDF-1.7", size=2 * 1024 * 1024), max_size_mb=1)
+    assert excinfo.value.status_code == 413
+
+def test_measures_size_when_unknown():
+    """Tests that the size is measured from the stream when not reported."""
+    with pytest.raises(APIError) as excinfo:
+        validate_file_upload(make_upload(b"%PDF-1.7" + b"0" * 1024 * 1024), max_size_mb=1)
+    assert excinfo.value.status_code == 413
+
+def test_rejects_content_that_is_not_pdf():
+    """Tests that a declared PDF without the PDF header is refused."""
+    with pytest.raises(APIError) as excinfo:
+        validate_file_upload(make_upload(b"MZ\x90\x00 not a pdf"))
+    assert excinfo.value.status_code == 400
+
+@pytest.mark.parametrize("path", ["/api/upload-document", "/api/scan-contract"])
+def test_oversized_body_rejected_before_parsing(path):
+    """Tests that an upload route answers 413 from Content-Length alone."""
+    response = TestClient(app).post(
+        path,
+        content=b"0" * (11 * 1024 * 1024),
+        headers={"content-type": "multipart/form-data; boundary=x"},
+    )
+    assert response.status_code == 413
+    assert response.json()["error_code"] == "FILE_UPLOAD_ERROR"
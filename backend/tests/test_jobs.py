@@ -0,0 +1,62 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+from backend import main
+
+def wait_for_job(client, job_id):
+    for _ in range(100):
+        status = client.get(f"/status/{job_id}").json()["status"]
+        if status in ("done", "failed"):
+            return status
+        time.sleep(0.05)
+    return status
+
+def test_job_lifecycle(blank_pdf):
+    """Tests that a job is accepted, finishes, serves its result and expires."""
+    with TestClient(main.app) as client:
+        response = client.post(
+            "/jobs", files={"file": ("bill.pdf", blank_pdf, "application/pdf")}
+        )
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+        assert wait_for_job(client, job_id) == "done"
+
+        response = client.get(f"/result/{job_id}")
+        assert response.status_code == 200
+        assert response.content.startswith(b"%PDF")
+
+        # Once the janitor has purged the stamped PDF the result is gone
+        os.remove(main.JOBS[job_id]["result"][0])
+        assert client.get(f"/result/{job_id}").status_code == 410
+
+        # ...and the job itself is forgotten on the same schedule
+        assert main.expire_jobs(max_age=0) >= 1
+        assert client.get(f"/status/{job_id}").status_code == 404
+        assert client.get(f"/result/{job_id}").status_code == 404
+
+def test_unknown_job():
+    """Tests that an unknown job id answers 404."""
+    client = TestClient(main.app)
+    assert client.get("/status/missing").status_code == 404
+
+def test_cancelled_job_is_marked_failed(monkeypatch):
+    """Tests that a job cancelled mid-run does not stay processing."""
+    async def never_finishes(*args):
+        await asyncio.Event().wait()
+
+    async def run_and_cancel():
+        main.JOBS["cancelled"] = {"status": "queued", "result": None, "error": None, "created": time.time()}
+        task = asyncio.create_task(main._run_job("cancelled", "unused.pdf", "0"))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    monkeypatch.setattr(main, "run_in_process_pool", never_finishes)
+    asyncio.run(run_and_cancel())
+    assert main.JOBS.pop("cancelled")["status"] == "failed"
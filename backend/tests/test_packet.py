@@ -0,0 +1,29 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routes import packet
+
+app = FastAPI()
+app.include_router(packet.router)
+client = TestClient(app)
+
+def test_generate_packet_returns_packet():
+    """Tests that the packet endpoint returns its three parts as JSON."""
+    response = client.post("/api/wizard/packet", json={
+        "full_name": "Jane Doe",
+        "statement_id": "42",
+        "billing_text": "Account Number: 123\nAmount Due: $456",
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"cover_letter", "endorsement", "placement_guide"}
+    assert "Billing Statement #42" in data["cover_letter"]
+    assert "Top Zone:" in data["placement_guide"]
+
+def test_generate_packet_uses_defaults():
+    """Tests that an empty request falls back to the default fields."""
+    response = client.post("/api/wizard/packet", json={})
+    assert response.status_code == 200
+    data = response.json()
+    assert "XYZ Utility Corp" in data["cover_letter"]
+    assert all(line.startswith("- ") for line in data["placement_guide"].split("\n\n"))
@@ -1,10 +1,4 @@
-import os
-import sys
-
-# Add the project root to the Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
-
-from packages.LocalAgentCore.InstrumentAnnotator.parser import BillParser  # noqa: E402
+from packages.LocalAgentCore.InstrumentAnnotator.parser import BillParser
 
 
 def test_parse_free_text_bill():
@@ -0,0 +1,30 @@
+import mmap
+
+import pytest
+from reportlab.pdfgen import canvas
+
+from backend import pipeline
+
+@pytest.fixture
+def pdf_map(tmp_path):
+    path = tmp_path / "doc.pdf"
+    pdf = canvas.Canvas(str(path))
+    for text in ("first page", "second page"):
+        pdf.drawString(72, 720, text)
+        pdf.showPage()
+    pdf.save()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY) as mapped:
+        yield mapped
+
+@pytest.mark.parametrize("extractor, module", [("pymupdf", "pymupdf"), ("pdfium", "pypdfium2")])
+def test_extract_text_layer_from_mmap(monkeypatch, pdf_map, extractor, module):
+    """Tests that each optional extractor reads a memory-mapped PDF."""
+    monkeypatch.setattr(pipeline, extractor, pytest.importorskip(module))
+    monkeypatch.setattr(pipeline, "_EXTRACTOR", extractor)
+
+    page_count, text = pipeline.extract_text_layer(pdf_map)
+    assert page_count == 2
+    assert "first page" in text and "second page" not in text
+
+    _, text = pipeline.extract_text_layer(pdf_map, all_pages=True)
+    assert "first page" in text and "second page" in text
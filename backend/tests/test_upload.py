@@ -0,0 +1,22 @@
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+client = TestClient(app)
+
+def test_upload_returns_stamped_pdf(blank_pdf):
+    """Tests that /upload answers with the stamped PDF itself."""
+    response = client.post(
+        "/upload", files={"file": ("bill.pdf", blank_pdf, "application/pdf")}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+    assert "processed_" in response.headers["content-disposition"]
+
+def test_upload_rejects_other_file_types():
+    """Tests that non-PDF uploads are refused before processing."""
+    response = client.post(
+        "/upload", files={"file": ("bill.txt", b"hello", "text/plain")}
+    )
+    assert response.status_code == 400
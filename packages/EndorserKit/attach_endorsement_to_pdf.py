@@ -1,28 +1,23 @@
+import functools
 import json
+import logging
 from pypdf import PdfReader, PdfWriter
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from io import BytesIO
 
-def attach_endorsement_to_pdf_function(original_pdf_path, endorsement_data, output_pdf_path, ink_color, page_index):
-    print(f"🔧 Creating endorsement overlay...")
-    
+logger = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=1)
+def _endorsement_overlay_page():
+    """The overlay does not depend on the endorsement, so it is drawn once."""
+    logger.debug("Creating endorsement overlay")
+
     # Create overlay PDF with endorsement text
     packet = BytesIO()
     can = canvas.Canvas(packet, pagesize=letter)
     
-    # Get page dimensions
-    page_width, page_height = letter  # 612, 792 points
-    
-    # Set ink color
-    if ink_color == "blue":
-        text_color = (0, 0, 1)
-    elif ink_color == "red":
-        text_color = (1, 0, 0)
-    else:
-        text_color = (0, 0, 0)  # black
-    
     # Create a highly visible background box for the endorsement
     # Using exact coordinates from interactive positioner
     box_x = 579  # Precise position from drag-and-drop tool
@@ -54,26 +49,35 @@ def attach_endorsement_to_pdf_function(original_pdf_path, endorsement_data, outp
     
     can.save()
     packet.seek(0)
-    print(f"✅ Overlay PDF created")
+    logger.debug("Overlay PDF created")
+    return PdfReader(packet).pages[0]
+
+
+def attach_endorsement_to_pdf_function(original_pdf_path, endorsement_data, output_pdf_path, ink_color, page_index, reader=None):
+    """
+    Write a copy of the original PDF with the endorsement overlay merged onto
+    ``page_index``, which is moved to the front. Pass an already opened
+    ``reader`` to stamp several outputs from one parse; it is not modified.
+    """
+    overlay_page = _endorsement_overlay_page()
 
     try:
-        # Load original PDF
-        print(f"📖 Reading original PDF: {original_pdf_path}")
-        reader = PdfReader(original_pdf_path)
+        if reader is None:
+            # Load original PDF
+            logger.debug("Reading original PDF: %s", original_pdf_path)
+            reader = PdfReader(original_pdf_path)
         writer = PdfWriter()
-        overlay = PdfReader(packet)
 
-        print(f"📄 Original PDF has {len(reader.pages)} pages")
-        print(f"🎨 Overlay PDF has {len(overlay.pages)} pages")
+        logger.debug("Original PDF has %d pages", len(reader.pages))
 
         # Merge overlay onto specified page
         if page_index < len(reader.pages):
-            page = reader.pages[page_index]
-            overlay_page = overlay.pages[0]
-            
-            print(f"🔀 Merging overlay onto page {page_index}")
+            # add_page clones the page into the writer, so merging onto the
+            # clone leaves a shared reader untouched
+            page = writer.add_page(reader.pages[page_index])
+
+            logger.debug("Merging overlay onto page %d", page_index)
             page.merge_page(overlay_page)
-            writer.add_page(page)
 
             # Add remaining pages
             for i, p in enumerate(reader.pages):
@@ -81,18 +85,15 @@ def attach_endorsement_to_pdf_function(original_pdf_path, endorsement_data, outp
                     writer.add_page(p)
 
             # Save new PDF
-            print(f"💾 Saving endorsed PDF to: {output_pdf_path}")
+            logger.debug("Saving endorsed PDF to: %s", output_pdf_path)
             with open(output_pdf_path, "wb") as f:
                 writer.write(f)
-            
-            print(f"✅ Endorsement successfully attached!")
-            
+
         else:
-            print(f"❌ Page index {page_index} is out of range for PDF with {len(reader.pages)} pages")
-            raise Exception(f"Page index {page_index} is out of range")
+            raise Exception(f"Page index {page_index} is out of range for PDF with {len(reader.pages)} pages")
             
     except Exception as e:
-        print(f"❌ Error attaching endorsement: {str(e)}")
+        logger.error("Error attaching endorsement: %s", e)
         raise
 
-    print(f"📎 Endorsement chain attached to {output_pdf_path}")
+    logger.debug("Endorsement chain attached to %s", output_pdf_path)
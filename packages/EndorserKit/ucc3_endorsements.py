@@ -1,9 +1,36 @@
 import base64
+import functools
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.backends import default_backend
 
+@functools.lru_cache(maxsize=4)
+def _load_pem_private_key(private_key_pem: str):
+    # Deserializing a PEM key costs far more than a signature, and a worker
+    # signs with the same few keys, so each one is parsed only once.
+    return serialization.load_pem_private_key(
+        private_key_pem.encode('utf-8'),
+        password=None,  # Assuming no password, adjust if needed
+        backend=default_backend()
+    )
+
+def _resolve_private_key(private_key_pem: str = None, private_key_object=None):
+    """Return the signing key from a PEM string or an already loaded key object."""
+    if private_key_pem:
+        try:
+            private_key = _load_pem_private_key(private_key_pem)
+        except Exception as e:
+            raise Exception(f"Error loading private key from PEM string: {e}")
+    elif private_key_object:
+        private_key = private_key_object
+    else:
+        raise ValueError("Either 'private_key_pem' (as a string) or 'private_key_object' must be provided.")
+
+    if not hasattr(private_key, 'sign'):
+        raise Exception("Provided private key object does not have a 'sign' method (is it an RSA private key?).")
+    return private_key
+
 def sign_endorsement(endorsement_data, endorser_name, private_key_pem: str = None, private_key_object=None):
     """
     Signs an endorsement using an RSA private key.
@@ -23,22 +50,7 @@ def sign_endorsement(endorsement_data, endorser_name, private_key_pem: str = Non
         ValueError: If neither private_key_pem nor private_key_object is provided.
         Exception: For issues with key loading or signing.
     """
-    if private_key_pem:
-        try:
-            private_key = serialization.load_pem_private_key(
-                private_key_pem.encode('utf-8'),
-                password=None,  # Assuming no password, adjust if needed
-                backend=default_backend()
-            )
-        except Exception as e:
-            raise Exception(f"Error loading private key from PEM string: {e}")
-    elif private_key_object:
-        private_key = private_key_object
-    else:
-        raise ValueError("Either 'private_key_pem' (as a string) or 'private_key_object' must be provided.")
-
-    if not hasattr(private_key, 'sign'):
-        raise Exception("Provided private key object does not have a 'sign' method (is it an RSA private key?).")
+    private_key = _resolve_private_key(private_key_pem, private_key_object)
 
     # Convert endorsement data to bytes
     # Assuming endorsement_data can be converted to a string, similar to PowerShell's .ToString()
@@ -63,3 +75,23 @@ def sign_endorsement(endorsement_data, endorser_name, private_key_pem: str = Non
         setattr(endorsement_data, 'signature', base64.b64encode(signature).decode('utf-8'))
 
     return endorsement_data
+
+def sign_endorsements_batch(endorsements, endorser_name, private_key_pem: str = None, private_key_object=None):
+    """
+    Signs several endorsements with the same RSA private key, loading the key
+    only once for the whole batch.
+
+    Args:
+        endorsements: The endorsement objects/data to be signed.
+        endorser_name (str): The name of the endorser.
+        private_key_pem (str, optional): The RSA private key as a PEM-formatted string.
+        private_key_object: An already loaded cryptography RSA private key object.
+
+    Returns:
+        A list of the signed endorsements, in the order given.
+    """
+    private_key = _resolve_private_key(private_key_pem, private_key_object)
+    return [
+        sign_endorsement(endorsement, endorser_name, private_key_object=private_key)
+        for endorsement in endorsements
+    ]
@@ -1,6 +1,43 @@
+import copy
+import os
+import threading
+from collections import OrderedDict
+
 import yaml
 
+# Set OVERLAY_CACHE_DISABLE=1 to reparse configs on every call while editing them.
+OVERLAY_CACHE_DISABLE = os.environ.get("OVERLAY_CACHE_DISABLE") == "1"
+_YAML_CACHE_MAX_ENTRIES = 100
+_yaml_cache = OrderedDict()  # path -> ((mtime_ns, size), parsed config)
+_yaml_cache_lock = threading.Lock()
+# libyaml's C loader when PyYAML was built with it; same safe subset either way
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 def load_yaml_config(config_path: str) -> dict:
     with open(config_path, 'r') as file:
-        config = yaml.safe_load(file)
+        config = yaml.load(file, Loader=_SafeLoader)
     return config
+
+def cached_load_yaml(config_path: str) -> dict:
+    """
+    Like load_yaml_config, but only reparses when the file's mtime or size
+    changes. Returns a deep copy, so callers may modify the result.
+    """
+    if OVERLAY_CACHE_DISABLE:
+        return load_yaml_config(config_path)
+
+    st = os.stat(config_path)
+    key = (st.st_mtime_ns, st.st_size)
+    with _yaml_cache_lock:
+        entry = _yaml_cache.get(config_path)
+        if entry is not None and entry[0] == key:
+            _yaml_cache.move_to_end(config_path)
+            return copy.deepcopy(entry[1])
+
+    config = load_yaml_config(config_path)
+    with _yaml_cache_lock:
+        _yaml_cache[config_path] = (key, config)
+        _yaml_cache.move_to_end(config_path)
+        while len(_yaml_cache) > _YAML_CACHE_MAX_ENTRIES:
+            _yaml_cache.popitem(last=False)
+    return copy.deepcopy(config)
@@ -1,9 +1,10 @@
 def parse_statement(text):
     flags = []
+    lowered = text.lower()
     if "$" in text:
         flags.append("Federal Reserve Notes — securities, not lawful money")
-    if "amount due" in text.lower():
+    if "amount due" in lowered:
         flags.append("Presumption of debt — challenge with verified claim")
-    if "account number" in text.lower():
+    if "account number" in lowered:
         flags.append("Corporate tracking ID — not lawful obligation")
     return flags
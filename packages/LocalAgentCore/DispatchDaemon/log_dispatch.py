@@ -1,6 +1,88 @@
+import atexit
 import json
+import os
+import threading
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+REGISTRY_PATH = "LocalAgentCore/DispatchDaemon/dispatch_registry.jsonl"
+
+# log_dispatch is the sole appender to the registry; each entry is one
+# JSON object per line, so recording a dispatch never rewrites prior entries.
+# The append handle is opened once and shared across calls. Anything that
+# replaces the registry file must do so through rewrite_registry, which holds
+# _registry_lock for the whole rewrite so no append can land on the old file.
+_registry_handle = None
+_registry_lock = threading.Lock()
+
+
+def dumps_entry(entry):
+    """
+    Serializes a registry entry to a single JSON line as bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(entry) + b"\n"
+    return json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def load_registry(path=REGISTRY_PATH):
+    """
+    Streams dispatch entries from the registry, one per line.
+    """
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield _loads(line)
+    except FileNotFoundError:
+        return
+
+
+def _close_registry_handle_locked():
+    global _registry_handle
+    if _registry_handle is not None:
+        _registry_handle.close()
+        _registry_handle = None
+
+
+def close_registry_handle():
+    """
+    Closes the shared append handle; the next dispatch reopens the file.
+    """
+    with _registry_lock:
+        _close_registry_handle_locked()
+
+
+def rewrite_registry(update, path=REGISTRY_PATH):
+    """
+    Replaces the registry with ``update(entries)`` applied to its current
+    entries. The lock is held from the read to the swap, so concurrent
+    dispatches wait and then append to the new file.
+    """
+    with _registry_lock:
+        _close_registry_handle_locked()
+        registry = list(load_registry(path))
+        update(registry)
+        # Write the new registry beside the old one and swap it in atomically,
+        # so a crash mid-write never leaves a truncated registry behind.
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(dumps_entry(entry) for entry in registry))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+atexit.register(close_registry_handle)
+
+
 def log_dispatch(packet_id, method, recipient, location):
     entry = {
         "packet_id": packet_id,
@@ -10,13 +92,10 @@ def log_dispatch(packet_id, method, recipient, location):
         "timestamp": datetime.utcnow().isoformat(),
         "status": "Dispatched"
     }
-    try:
-        with open("LocalAgentCore/DispatchDaemon/dispatch_registry.json", "r+") as f:
-            registry = json.load(f)
-            registry.append(entry)
-            f.seek(0)
-            json.dump(registry, f, indent=2)
-    except FileNotFoundError:
-        with open("LocalAgentCore/DispatchDaemon/dispatch_registry.json", "w") as f:
-            json.dump([entry], f, indent=2)
+    global _registry_handle
+    with _registry_lock:
+        if _registry_handle is None:
+            _registry_handle = open(REGISTRY_PATH, "ab", buffering=1 << 16)
+        _registry_handle.write(dumps_entry(entry))
+        _registry_handle.flush()
     return entry
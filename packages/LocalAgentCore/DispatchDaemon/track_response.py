@@ -1,12 +1,12 @@
-import json
+from packages.LocalAgentCore.DispatchDaemon.log_dispatch import rewrite_registry
+
 
 def update_status(packet_id, new_status):
-    with open("LocalAgentCore/DispatchDaemon/dispatch_registry.json", "r+") as f:
-        registry = json.load(f)
+    def set_status(registry):
         for entry in registry:
             if entry["packet_id"] == packet_id:
                 entry["status"] = new_status
                 break
-        f.seek(0)
-        json.dump(registry, f, indent=2)
+
+    rewrite_registry(set_status)
     return new_status
@@ -8,6 +8,7 @@ class BillParser:
             "bill_number": re.compile(r"(?:Account Number|Account No|Invoice Number|Bill No|Reference No)[:\s]*([\w-]+)", re.IGNORECASE),
             "total_amount": re.compile(r"(?:Total Amount|Amount Due|Balance Due)[:\s]*[\$€£¥]?\s*([\d.,]+)", re.IGNORECASE),
             "currency": re.compile(r"(?:Total Amount|Amount Due|Balance Due)[:\s]*([\$€£¥])", re.IGNORECASE), # Capture the currency symbol
+            "amount_currency": re.compile(r"(?:Total Amount|Amount Due|Balance Due)[:\s]*([\$€£¥]?)\s*([\d.,]+)", re.IGNORECASE),
             "customer_name": re.compile(r"(?:Customer Name|Client Name|Name|To)[:\s]*([A-Z][a-z]+(?:\s[A-Z][a-z]+){1,3})", re.IGNORECASE), # Placeholder, as it's not in the sample PDF
             "remittance_coupon_keywords": re.compile(r"(?:Remittance Coupon|Payment Stub|Please Detach|Return with Payment|please return bottom portion with your payment)", re.IGNORECASE)
         }
@@ -83,11 +84,7 @@ class BillParser:
         if match:
             bill_data["bill_number"] = match.group(1).strip()
         
-        amount_currency_match = re.search(
-            r"(?:Total Amount|Amount Due|Balance Due)[:\s]*([\$€£¥]?)\s*([\d.,]+)",
-            bill_text,
-            re.IGNORECASE
-        )
+        amount_currency_match = self.patterns["amount_currency"].search(bill_text)
         if amount_currency_match:
             currency_symbol = amount_currency_match.group(1)
             amount_str = amount_currency_match.group(2)
@@ -1,11 +1,19 @@
 import json
+import logging
 from pypdf import PdfReader, PdfWriter
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from io import BytesIO
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
 
-def attach_endorsement_to_pdf_function(original_pdf_path: str, endorsement_data: Dict[str, Any], output_pdf_path: str, ink_color: str, page_index: int) -> bool:
+logger = logging.getLogger(__name__)
+
+try:
+    import pikepdf
+except ImportError:  # pikepdf is optional; pypdf rewrites the PDF without it
+    pikepdf = None
+
+def attach_endorsement_to_pdf_function(original_pdf_path: str, endorsement_data: Dict[str, Any], output_pdf_path: str, ink_color: str, page_index: int, reader: Optional[PdfReader] = None) -> bool:
     # Define color map
     color_map: Dict[str, Tuple[float, float, float]] = {
         "black": (0, 0, 0),
@@ -44,8 +52,14 @@ def attach_endorsement_to_pdf_function(original_pdf_path: str, endorsement_data:
         can.save()
         packet.seek(0)
 
-        # Load original PDF
-        reader = PdfReader(original_pdf_path)
+        if pikepdf is not None:
+            _overlay_with_qpdf(original_pdf_path, packet, output_pdf_path, page_index)
+            logger.debug("Endorsement chain attached to %s", output_pdf_path)
+            return True
+
+        # Load original PDF unless the caller already has it open
+        if reader is None:
+            reader = PdfReader(original_pdf_path)
         writer = PdfWriter()
         overlay = PdfReader(packet)
 
@@ -67,12 +81,30 @@ def attach_endorsement_to_pdf_function(original_pdf_path: str, endorsement_data:
         with open(output_pdf_path, "wb") as f:
             writer.write(f)
 
-        print(f"📎 Endorsement chain attached to {output_pdf_path}")
+        logger.debug("Endorsement chain attached to %s", output_pdf_path)
         return True # Indicate success
     except Exception as e:
-        print(f"❌ Error attaching endorsement to PDF: {e}")
+        logger.error("Error attaching endorsement to PDF: %s", e)
         return False # Indicate failure
 
+def _overlay_with_qpdf(original_pdf_path: str, overlay_pdf: BytesIO, output_pdf_path: str, page_index: int) -> None:
+    """
+    Overlay the first page of ``overlay_pdf`` onto one page with qpdf.
+
+    Only the stamped page gains a new content stream; every other object is
+    copied through without being decoded or recompressed. As in the pypdf
+    path, the stamped page is moved to the front.
+    """
+    with pikepdf.open(original_pdf_path) as pdf, pikepdf.open(overlay_pdf) as overlay:
+        if not (0 <= page_index < len(pdf.pages)):
+            raise ValueError(f"Invalid page_index: {page_index}. PDF has {len(pdf.pages)} pages.")
+
+        pdf.pages[page_index].add_overlay(overlay.pages[0])
+        if page_index != 0:
+            pdf.pages.insert(0, pdf.pages[page_index])
+            del pdf.pages[page_index + 1]
+        pdf.save(output_pdf_path)
+
 def stamp_pdf_with_endorsement(original_pdf_path: str, output_pdf_path: str, x: float, y: float, endorsement_text: str, qualifier: str) -> bool:
     try:
         # Create an overlay with the endorsement text at the specified coordinates
@@ -108,5 +140,5 @@ def stamp_pdf_with_endorsement(original_pdf_path: str, output_pdf_path: str, x:
 
         return True
     except Exception as e:
-        print(f"Error stamping PDF: {e}")
+        logger.error("Error stamping PDF: %s", e)
         return False
\ No newline at end of file
@@ -3,9 +3,10 @@ def tag_zones(layout):
     for zone, lines in layout.items():
         tags[zone] = []
         for line in lines:
-            if "amount due" in line.lower():
+            lowered = line.lower()
+            if "amount due" in lowered:
                 tags[zone].append({"type": "debt_presumption", "text": line})
-            if "account number" in line.lower():
+            if "account number" in lowered:
                 tags[zone].append({"type": "tracking_id", "text": line})
             if "$" in line:
                 tags[zone].append({"type": "currency", "text": line})
@@ -0,0 +1,41 @@
+import pytest
+from pypdf import PdfReader
+from reportlab.pdfgen import canvas
+
+from packages.LocalAgentCore.InstrumentAnnotator import stamper
+
+def make_pdf(path, page_texts):
+    pdf = canvas.Canvas(str(path))
+    for text in page_texts:
+        pdf.drawString(72, 300, text)
+        pdf.showPage()
+    pdf.save()
+
+ENDORSEMENT = {
+    "endorsements": [{"endorser_name": "Jane Doe", "text": "Pay to the order of", "signature": "abc"}],
+    "signature_block": {"signed_by": "Jane Doe", "capacity": "Payer", "signature": "abc", "date": "2025-01-01"},
+}
+
+def test_qpdf_overlay_moves_stamped_page_first(tmp_path):
+    """Tests that the qpdf path stamps page_index and moves it to the front."""
+    pytest.importorskip("pikepdf")
+    source, output = tmp_path / "in.pdf", tmp_path / "out.pdf"
+    make_pdf(source, ["first page", "second page", "third page"])
+
+    assert stamper.attach_endorsement_to_pdf_function(
+        str(source), ENDORSEMENT, str(output), "blue", page_index=1
+    )
+    texts = [page.extract_text() for page in PdfReader(output).pages]
+    assert len(texts) == 3
+    assert "second page" in texts[0] and "Endorsement Chain Attached" in texts[0]
+    assert "first page" in texts[1] and "third page" in texts[2]
+
+def test_qpdf_overlay_rejects_bad_page_index(tmp_path):
+    """Tests that the qpdf path reports failure for a page past the end."""
+    pytest.importorskip("pikepdf")
+    source, output = tmp_path / "in.pdf", tmp_path / "out.pdf"
+    make_pdf(source, ["only page"])
+    assert not stamper.attach_endorsement_to_pdf_function(
+        str(source), ENDORSEMENT, str(output), "blue", page_index=5
+    )
+    assert not output.exists()
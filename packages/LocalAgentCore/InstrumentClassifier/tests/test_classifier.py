@@ -0,0 +1,23 @@
+from packages.LocalAgentCore.InstrumentClassifier.classifier import parse_negotiable_instrument
+
+def test_detects_instrument_by_keyword():
+    """Tests that a keyword identifies its instrument type."""
+    result = parse_negotiable_instrument("This is a U.S. Treasury bond issued in 2020.")
+    assert [item["instrument_type"] for item in result] == ["treasury bonds / notes"]
+    assert result[0]["status"] == "valid"
+
+def test_keywords_match_whole_words_only():
+    """Tests that short keywords do not match inside longer words."""
+    assert parse_negotiable_instrument("Please read the abcd manual.") == []
+
+def test_canceled_stamp_status():
+    """Tests that a canceled stamp is reported as canceled."""
+    result = parse_negotiable_instrument("A canceled U.S. stamp from 1900.")
+    assert result[0]["instrument_type"] == "canceled u.s. stamps"
+    assert result[0]["status"] == "canceled"
+
+def test_plural_keywords_match():
+    """Tests that plural forms of keywords still identify the instrument."""
+    assert [item["instrument_type"] for item in parse_negotiable_instrument("Federal Reserve Notes")] == ["federal reserve notes"]
+    assert [item["instrument_type"] for item in parse_negotiable_instrument("Treasury bonds")] == ["treasury bonds / notes"]
+    assert [item["instrument_type"] for item in parse_negotiable_instrument("five dollars")] == ["federal reserve notes"]
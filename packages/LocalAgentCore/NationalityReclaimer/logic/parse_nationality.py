@@ -1,19 +1,26 @@
+import re
+
+UNLAWFUL_TERMS = ["U.S. citizen", "resident", "person", "individual"]
+LAWFUL_TERMS = {
+    "Texan": "Texan National",
+    "Florida": "Floridian National",
+    "California": "Californian National"
+}
+
+# One alternation over every term, so the input is scanned in a single pass.
+_TERM_PATTERN = re.compile(
+    "|".join(re.escape(term) for term in [*UNLAWFUL_TERMS, *LAWFUL_TERMS]),
+    re.IGNORECASE,
+)
+_UNLAWFUL_LC = [(term.lower(), term) for term in UNLAWFUL_TERMS]
+_LAWFUL_LC = [(key.lower(), value) for key, value in LAWFUL_TERMS.items()]
+
+
 def parse_nationality(user_input):
-    unlawful_terms = ["U.S. citizen", "resident", "person", "individual"]
-    lawful_terms = {
-        "Texan": "Texan National",
-        "Florida": "Floridian National",
-        "California": "Californian National"
-    }
-    contradictions = []
-    for term in unlawful_terms:
-        if term.lower() in user_input.lower():
-            contradictions.append(term)
-    suggested = []
-    for key, value in lawful_terms.items():
-        if key.lower() in user_input.lower():
-            suggested.append(value)
+    found = {match.lower() for match in _TERM_PATTERN.findall(user_input)}
+    contradictions = [term for lowered, term in _UNLAWFUL_LC if lowered in found]
+    suggested = [value for lowered, value in _LAWFUL_LC if lowered in found]
     return {
         "contradictions": contradictions,
         "suggested_nationalities": suggested
-    }
\ No newline at end of file
+    }
@@ -1,12 +1,16 @@
 from datetime import date
+from functools import lru_cache
 import os
 
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'templates')
+
+@lru_cache(maxsize=None)
 def load_template(template_name):
     """
-    Loads a template from the templates directory.
+    Loads a template from the templates directory. Templates are static, so
+    each one is read from disk once per process.
     """
-    dir_path = os.path.dirname(os.path.realpath(__file__))
-    with open(os.path.join(dir_path, '..', 'templates', template_name), 'r') as f:
+    with open(os.path.join(TEMPLATE_DIR, template_name), 'r') as f:
         return f.read()
 
 def create_trust_documents(trust_type, settlor_name, trustee_name, beneficiaries, trust_property):
@@ -1,6 +1,9 @@
 import yaml
 
+# libyaml's C loader when PyYAML was built with it; same safe subset either way
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 def load_yaml_config(config_path: str) -> dict:
     with open(config_path, 'r') as file:
-        config = yaml.safe_load(file)
+        config = yaml.load(file, Loader=_SafeLoader)
     return config